@@ -0,0 +1 @@
+"""Micro-benchmarks for the Vodafone Station integration."""
@@ -0,0 +1,102 @@
+"""Benchmark the SJCL login crypto.
+
+Run from the repository root with ``python -m benchmarks.bench_crypto``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import secrets
+import timeit
+
+from custom_components.ha_vodafone_router.sjcl import SJCLContext, clear_key_cache
+
+from .sjcl_hex import SJCL
+
+PASSWORD = "password"
+
+
+def hex_login(salt: str, iv: str, payload: str, nonce_cipher: str) -> str:
+    """The login crypto through the hex string API, kept as the baseline."""
+    key = SJCL.pbkdf2(
+        PASSWORD, salt, SJCL.DEFAULT_SJCL_ITERATIONS, SJCL.DEFAULT_SJCL_KEYSIZEBITS
+    )
+    SJCL.ccm_encrypt(key, payload, iv, "loginPassword", SJCL.DEFAULT_SJCL_TAGLENGTH)
+    return SJCL.ccm_decrypt(key, nonce_cipher, iv, "nonce", SJCL.DEFAULT_SJCL_TAGLENGTH)
+
+
+def context_login(salt: str, iv: str, payload: str, nonce_cipher: str) -> str:
+    crypto = SJCLContext.from_password(PASSWORD, salt, iv)
+    crypto.encrypt(payload, "loginPassword")
+    return crypto.decrypt(nonce_cipher, "nonce")
+
+
+def cold_context_login(salt: str, iv: str, payload: str, nonce_cipher: str) -> str:
+    clear_key_cache()
+    return context_login(salt, iv, payload, nonce_cipher)
+
+
+def run(number: int, repeat: int) -> None:
+    salt = secrets.token_hex(8)
+    iv = secrets.token_hex(8)
+    payload = json.dumps({"Password": PASSWORD, "Nonce": secrets.token_hex(16)})
+    csrf_nonce = secrets.token_hex(16)
+    nonce_cipher = SJCL.ccm_encrypt(
+        SJCL.pbkdf2(
+            PASSWORD,
+            salt,
+            SJCL.DEFAULT_SJCL_ITERATIONS,
+            SJCL.DEFAULT_SJCL_KEYSIZEBITS,
+        ),
+        csrf_nonce,
+        iv,
+        "nonce",
+        SJCL.DEFAULT_SJCL_TAGLENGTH,
+    )
+
+    key_hex = SJCL.pbkdf2(
+        PASSWORD, salt, SJCL.DEFAULT_SJCL_ITERATIONS, SJCL.DEFAULT_SJCL_KEYSIZEBITS
+    )
+    crypto = SJCLContext.from_password(PASSWORD, salt, iv)
+    assert crypto.key.hex() == key_hex
+
+    cases = {
+        "pbkdf2 hex": lambda: SJCL.pbkdf2(
+            PASSWORD,
+            salt,
+            SJCL.DEFAULT_SJCL_ITERATIONS,
+            SJCL.DEFAULT_SJCL_KEYSIZEBITS,
+        ),
+        "pbkdf2 cached": lambda: SJCLContext.from_password(PASSWORD, salt, iv),
+        "encrypt hex": lambda: SJCL.ccm_encrypt(
+            key_hex, payload, iv, "loginPassword", SJCL.DEFAULT_SJCL_TAGLENGTH
+        ),
+        "encrypt context": lambda: crypto.encrypt(payload, "loginPassword"),
+        "decrypt hex": lambda: SJCL.ccm_decrypt(
+            key_hex, nonce_cipher, iv, "nonce", SJCL.DEFAULT_SJCL_TAGLENGTH
+        ),
+        "decrypt context": lambda: crypto.decrypt(nonce_cipher, "nonce"),
+        "login hex": lambda: hex_login(salt, iv, payload, nonce_cipher),
+        "login cold": lambda: cold_context_login(salt, iv, payload, nonce_cipher),
+        "relogin": lambda: context_login(salt, iv, payload, nonce_cipher),
+    }
+    for login in (hex_login, cold_context_login, context_login):
+        assert login(salt, iv, payload, nonce_cipher) == csrf_nonce
+
+    print(f"{'case':<16} {'us/op':>10}")
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=number, repeat=repeat))
+        print(f"{name:<16} {best / number * 1_000_000:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.number, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark overview_data.php parsing.
+
+Run from the repository root with ``python -m benchmarks.bench_parser``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+
+from custom_components.ha_vodafone_router.parser import (
+    JSON_BACKEND_ORJSON,
+    JSON_BACKEND_STDLIB,
+    LAN_ATTACHED_DEVICES,
+    extract_attached_devices,
+    orjson,
+)
+
+from .synthetic import make_overview_page
+
+DEVICE_COUNTS = (10, 100, 1_000, 10_000)
+
+
+def split_parse(text: str) -> dict[str, list]:
+    """The previous split based parser, kept as the baseline."""
+    return {
+        "json_lanAttachedDevice": json.loads(
+            text.split("json_lanAttachedDevice = ")[1].split(";")[0]
+        ),
+        "json_primaryWlanAttachedDevice": json.loads(
+            text.split("json_primaryWlanAttachedDevice = ")[1].split(";")[0]
+        ),
+    }
+
+
+def run(device_counts: tuple[int, ...], repeat: int) -> None:
+    parsers = {
+        "split": split_parse,
+        "raw_decode": lambda text: extract_attached_devices(text, JSON_BACKEND_STDLIB),
+    }
+    if orjson is not None:
+        parsers["orjson"] = lambda text: extract_attached_devices(
+            text, JSON_BACKEND_ORJSON
+        )
+
+    # Hostnames containing ';' break the split parser but not the extractor,
+    # and a "==" comparison of a device list is not an assignment
+    tricky = make_overview_page(50, 50, seed=1)
+    results = [parse(tricky) for name, parse in parsers.items() if name != "split"]
+    assert all(result == results[0] for result in results)
+    assert len(results[0][LAN_ATTACHED_DEVICES]) == 50
+
+    print(f"{'devices':>8} {'page KiB':>9} " + " ".join(f"{n:>12}" for n in parsers))
+    for count in device_counts:
+        text = make_overview_page(count // 2, count - count // 2)
+        expected = split_parse(text)
+        timings = []
+        for name, parse in parsers.items():
+            assert parse(text) == expected, name
+            number = max(1, 20_000 // count)
+            best = min(timeit.repeat(lambda: parse(text), number=number, repeat=repeat))
+            timings.append(best / number * 1_000)
+        print(
+            f"{count:>8} {len(text) / 1024:>9.1f} "
+            + " ".join(f"{ms:>10.3f}ms" for ms in timings)
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=DEVICE_COUNTS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(tuple(args.devices), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark the client against recorded router fixtures.
+
+Replays the fixtures written by ``benchmarks.record_fixture`` through
+VodafoneBox without a network, by default without the recorded latency.
+
+Run from the repository root with ``python -m benchmarks.bench_replay``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import glob
+import os
+import statistics
+import time
+
+from custom_components.ha_vodafone_router.parser import extract_attached_devices
+from custom_components.ha_vodafone_router.sources import OVERVIEW_ENDPOINT
+from custom_components.ha_vodafone_router.vodafone_box import VodafoneBox
+
+from .recording import ReplaySession, load_fixture
+
+FIXTURE_DIRECTORY = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def bench_parse(fixture: dict, rounds: int) -> float:
+    """Return the median parse time of the recorded overview pages in ms."""
+    pages = [
+        exchange["body"]
+        for exchange in fixture["exchanges"]
+        if exchange["endpoint"] == OVERVIEW_ENDPOINT and exchange["status"] == 200
+    ]
+    durations = []
+    for _ in range(rounds):
+        for page in pages:
+            start = time.perf_counter()
+            extract_attached_devices(page)
+            durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1_000 if durations else 0.0
+
+
+async def bench_fixture(
+    fixture: dict, rounds: int, time_scale: float
+) -> dict[str, float | int]:
+    session = ReplaySession(fixture, time_scale)
+    box = VodafoneBox("replay", session)
+
+    start = time.perf_counter()
+    await box.async_login("admin", fixture["password"])
+    login = time.perf_counter() - start
+
+    polls = []
+    devices = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = await box.async_get_connected_devices()
+        polls.append(time.perf_counter() - start)
+        devices = sum(len(device_list) for device_list in result.values())
+
+    return {
+        "devices": devices,
+        "login ms": login * 1_000,
+        "poll ms": statistics.median(polls) * 1_000,
+        "parse ms": bench_parse(fixture, rounds),
+        "requests": session.requests,
+    }
+
+
+async def run(paths: list[str], rounds: int, time_scale: float) -> None:
+    print(
+        f"{'fixture':<24} {'firmware':<36} {'devices':>8} {'login ms':>10}"
+        f" {'poll ms':>10} {'parse ms':>10} {'requests':>9}"
+    )
+    for path in paths:
+        fixture = load_fixture(path)
+        row = await bench_fixture(fixture, rounds, time_scale)
+        print(
+            f"{os.path.basename(path):<24} {fixture['firmware'] or '-':<36}"
+            f" {row['devices']:>8} {row['login ms']:>10.3f} {row['poll ms']:>10.3f}"
+            f" {row['parse ms']:>10.3f} {row['requests']:>9}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "fixtures",
+        nargs="*",
+        default=sorted(glob.glob(os.path.join(FIXTURE_DIRECTORY, "*.json"))),
+    )
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.0,
+        help="Factor applied to the recorded latency, 1 replays in real time",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.fixtures, args.rounds, args.time_scale))
+
+
+if __name__ == "__main__":
+    main()
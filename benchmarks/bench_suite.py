@@ -0,0 +1,211 @@
+"""Benchmark the polling path against the mock Vodafone Station.
+
+Covers login latency, overview fetch and parse throughput, MAC filtering and
+entity state evaluation for growing networks.
+
+Run from the repository root with ``python -m benchmarks.bench_suite``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+import aiohttp
+
+from custom_components.ha_vodafone_router.mac_filter import (
+    MacFilter,
+    parse_mac_filter,
+)
+from custom_components.ha_vodafone_router.models import (
+    Device,
+    DeviceSnapshot,
+    SnapshotDelta,
+    devices_from_router,
+)
+from custom_components.ha_vodafone_router.parser import extract_attached_devices
+from custom_components.ha_vodafone_router.vodafone_box import VodafoneBox
+
+from .mock_station import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    MockVodafoneStation,
+    start_mock_station,
+)
+from .synthetic import make_overview_page
+
+DEVICE_COUNTS = (10, 100, 1_000, 10_000)
+
+
+def _measure(function: Callable[[], object], rounds: int) -> float:
+    """Return the median duration of function in milliseconds."""
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1_000
+
+
+async def _async_measure(
+    function: Callable[[], Awaitable[object]], rounds: int
+) -> float:
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1_000
+
+
+def bench_parse(count: int, rounds: int) -> dict[str, float]:
+    text = make_overview_page(count // 2, count - count // 2)
+    duration = _measure(lambda: extract_attached_devices(text), rounds)
+    return {
+        "parse ms": duration,
+        "parse MiB/s": len(text) / (1024 * 1024) / (duration / 1_000),
+    }
+
+
+def _make_devices(count: int) -> dict[str, tuple]:
+    arrays = extract_attached_devices(
+        make_overview_page(count // 2, count - count // 2)
+    )
+    return {
+        "lanDevices": devices_from_router(arrays["json_lanAttachedDevice"]),
+        "wlanDevices": devices_from_router(arrays["json_primaryWlanAttachedDevice"]),
+    }
+
+
+def bench_device_records(count: int, rounds: int) -> dict[str, float]:
+    arrays = extract_attached_devices(
+        make_overview_page(count // 2, count - count // 2)
+    )
+    return {
+        "records ms": _measure(
+            lambda: [devices_from_router(entries) for entries in arrays.values()],
+            rounds,
+        )
+    }
+
+
+def filter_devices(
+    devices: dict[str, tuple[Device, ...]], mac_filter: MacFilter | None
+) -> dict[str, tuple[Device, ...]]:
+    """Filter already built records, the baseline for filtering while parsing."""
+    if not mac_filter:
+        return devices
+    return {
+        list_name: tuple(
+            device for device in device_list if mac_filter.matches(device.mac)
+        )
+        for list_name, device_list in devices.items()
+    }
+
+
+def bench_mac_filter(count: int, rounds: int) -> dict[str, float]:
+    arrays = extract_attached_devices(
+        make_overview_page(count // 2, count - count // 2)
+    )
+    devices = _make_devices(count)
+    # Track every other device
+    macs = [device.mac for device in devices["lanDevices"] + devices["wlanDevices"]]
+    mac_filter = parse_mac_filter(",".join(macs[::2]))
+    assert filter_devices(devices, mac_filter)["lanDevices"] == devices_from_router(
+        arrays["json_lanAttachedDevice"], mac_filter
+    )
+
+    # Prefixes, wildcard octets and exclusions go through the trie
+    matches = parse_mac_filter("AA-BB-CC, 11:*:33:44:55:66, !aa:bb:cc:00:*").matcher()
+    assert matches("aa:bb:cc:01:02:03")
+    assert not matches("aa:bb:cc:00:02:03")
+    assert matches("11:99:33:44:55:66")
+    assert not matches("11:99:33:44:55:67")
+    assert not matches("aa:bb:cd:01:02:03")
+    # Invalid entries alone track nothing, an empty option everything
+    assert not parse_mac_filter("aabbccddeeff").matcher()("aa:bb:cc:dd:ee:ff")
+    assert parse_mac_filter(" , ") is None
+
+    return {
+        "filter ms": _measure(lambda: filter_devices(devices, mac_filter), rounds),
+        # Filtering while building the records, as the integration does
+        "pruned ms": _measure(
+            lambda: [
+                devices_from_router(entries, mac_filter) for entries in arrays.values()
+            ],
+            rounds,
+        ),
+    }
+
+
+def bench_entity_state(count: int, rounds: int) -> dict[str, float]:
+    devices = _make_devices(count)
+    previous = DeviceSnapshot.from_router_data(devices)
+    macs = list(previous.connected)
+
+    def update_cycle() -> None:
+        # One coordinator update followed by every entity evaluating its state
+        snapshot = DeviceSnapshot.from_router_data(devices)
+        SnapshotDelta.between(previous, snapshot)
+        for mac in macs:
+            snapshot.is_connected(mac)
+
+    return {"state ms": _measure(update_cycle, rounds)}
+
+
+async def bench_router(count: int, rounds: int) -> dict[str, float]:
+    station = MockVodafoneStation(
+        lan_devices=count // 2, wlan_devices=count - count // 2
+    )
+    runner, address = await start_mock_station(station)
+    try:
+        async with aiohttp.ClientSession(
+            cookie_jar=aiohttp.DummyCookieJar()
+        ) as session:
+            box = VodafoneBox(address, session)
+            login = await _async_measure(
+                lambda: box.async_login(DEFAULT_USERNAME, DEFAULT_PASSWORD), rounds
+            )
+            poll = await _async_measure(box.async_get_connected_devices, rounds)
+    finally:
+        await runner.cleanup()
+    return {"login ms": login, "poll ms": poll}
+
+
+async def run(device_counts: tuple[int, ...], rounds: int) -> None:
+    rows = []
+    for count in device_counts:
+        row = {"devices": count}
+        row.update(await bench_router(count, rounds))
+        row.update(bench_parse(count, rounds))
+        row.update(bench_device_records(count, rounds))
+        row.update(bench_mac_filter(count, rounds))
+        row.update(bench_entity_state(count, rounds))
+        rows.append(row)
+
+    columns = list(rows[0])
+    print(" ".join(f"{column:>12}" for column in columns))
+    for row in rows:
+        print(
+            " ".join(
+                f"{row[column]:>12}"
+                if isinstance(row[column], int)
+                else f"{row[column]:>12.3f}"
+                for column in columns
+            )
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=DEVICE_COUNTS)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(tuple(args.devices), args.rounds))
+
+
+if __name__ == "__main__":
+    main()
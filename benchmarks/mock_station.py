@@ -0,0 +1,222 @@
+"""Local stand-in for a Vodafone Station.
+
+Implements the SJCL login handshake and the endpoints polled by the
+integration, with the same PBKDF2/AES-CCM parameters as the integration.
+
+Run from the repository root with ``python -m benchmarks.mock_station``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import secrets
+
+from aiohttp import web
+
+from .sjcl_hex import SJCL
+from .synthetic import make_overview_page
+
+DEFAULT_USERNAME = "admin"
+DEFAULT_PASSWORD = "password"
+
+_LANDING_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<title>Vodafone Station</title>
+<script type="text/javascript">
+var myIv = '{iv}';
+var mySalt = '{salt}';
+</script>
+</head>
+<body>
+{padding}
+</body>
+</html>
+"""
+
+
+class MockVodafoneStation:
+    """Serve the router endpoints used by VodafoneBox from memory."""
+
+    def __init__(
+        self,
+        lan_devices: int = 10,
+        wlan_devices: int = 10,
+        guest_wlan_devices: int = 0,
+        username: str = DEFAULT_USERNAME,
+        password: str = DEFAULT_PASSWORD,
+        landing_page_padding: int = 64 * 1024,
+    ):
+        self.username = username
+        self.password = password
+        self.iv = secrets.token_hex(8)
+        self.salt = secrets.token_hex(8)
+        self.key = SJCL.pbkdf2(
+            password,
+            self.salt,
+            SJCL.DEFAULT_SJCL_ITERATIONS,
+            SJCL.DEFAULT_SJCL_KEYSIZEBITS,
+        )
+        self.landing_page = _LANDING_PAGE.format(
+            iv=self.iv, salt=self.salt, padding="<!-- -->" * (landing_page_padding // 8)
+        )
+        self.set_devices(lan_devices, wlan_devices, guest_wlan_devices)
+
+        # PHPSESSID -> csrf nonce, None until the password was accepted
+        self.sessions: dict[str, str | None] = {}
+        self.established: set[str] = set()
+        self.request_counts: dict[str, int] = {}
+
+    def set_devices(
+        self, lan_devices: int, wlan_devices: int, guest_wlan_devices: int = 0
+    ) -> None:
+        """Change the device counts served by overview_data.php."""
+        self.overview_page = make_overview_page(
+            lan_devices, wlan_devices, guest_count=guest_wlan_devices
+        )
+
+    def create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._count_requests])
+        app.router.add_get("/", self._landing_page)
+        app.router.add_post("/php/ajaxSet_Password.php", self._set_password)
+        app.router.add_post("/php/ajaxSet_Session.php", self._set_session)
+        app.router.add_get("/php/overview_data.php", self._overview_data)
+        app.router.add_post("/php/logout.php", self._logout)
+        return app
+
+    @web.middleware
+    async def _count_requests(self, request: web.Request, handler):
+        self.request_counts[request.path] = self.request_counts.get(request.path, 0) + 1
+        return await handler(request)
+
+    def _session_id(self, request: web.Request) -> str | None:
+        session_id = request.cookies.get("PHPSESSID")
+        return session_id if session_id in self.sessions else None
+
+    def _is_authenticated(self, request: web.Request) -> bool:
+        session_id = self._session_id(request)
+        return (
+            session_id is not None
+            and self.sessions[session_id] is not None
+            and request.headers.get("csrfNonce") == self.sessions[session_id]
+        )
+
+    async def _landing_page(self, request: web.Request) -> web.Response:
+        response = web.Response(text=self.landing_page, content_type="text/html")
+        if self._session_id(request) is None:
+            session_id = secrets.token_hex(16)
+            self.sessions[session_id] = None
+            response.set_cookie("PHPSESSID", session_id)
+        return response
+
+    async def _set_password(self, request: web.Request) -> web.Response:
+        session_id = self._session_id(request)
+        payload = await request.json()
+        try:
+            credentials = json.loads(
+                SJCL.ccm_decrypt(
+                    self.key,
+                    payload["EncryptData"],
+                    self.iv,
+                    payload["AuthData"],
+                    SJCL.DEFAULT_SJCL_TAGLENGTH,
+                )
+            )
+        except Exception:  # noqa: BLE001 - wrong key means a wrong password
+            return web.json_response({"p_status": "Fail"})
+
+        if (
+            session_id is None
+            or payload.get("Name") != self.username
+            or credentials.get("Password") != self.password
+            or credentials.get("Nonce") != session_id
+        ):
+            return web.json_response({"p_status": "Fail"})
+
+        # The router rotates the session id on a successful login
+        del self.sessions[session_id]
+        session_id = secrets.token_hex(16)
+        csrf_nonce = secrets.token_hex(16)
+        self.sessions[session_id] = csrf_nonce
+
+        response = web.json_response(
+            {
+                "p_status": "Match",
+                "encryptData": SJCL.ccm_encrypt(
+                    self.key,
+                    csrf_nonce,
+                    self.iv,
+                    "nonce",
+                    SJCL.DEFAULT_SJCL_TAGLENGTH,
+                ),
+            }
+        )
+        response.set_cookie("PHPSESSID", session_id)
+        return response
+
+    async def _set_session(self, request: web.Request) -> web.Response:
+        if not self._is_authenticated(request):
+            return web.json_response({"LoginStatus": "no"})
+        self.established.add(request.cookies["PHPSESSID"])
+        return web.json_response({"LoginStatus": "yes"})
+
+    async def _overview_data(self, request: web.Request) -> web.Response:
+        if (
+            not self._is_authenticated(request)
+            or request.cookies["PHPSESSID"] not in self.established
+        ):
+            # Expired sessions are redirected to the login page
+            raise web.HTTPFound("/")
+        return web.Response(text=self.overview_page, content_type="text/html")
+
+    async def _logout(self, request: web.Request) -> web.Response:
+        if (session_id := self._session_id(request)) is not None:
+            del self.sessions[session_id]
+            self.established.discard(session_id)
+        return web.json_response({})
+
+
+async def start_mock_station(
+    station: MockVodafoneStation, host: str = "127.0.0.1", port: int = 0
+) -> tuple[web.AppRunner, str]:
+    """Start the station and return the runner and its host:port."""
+    runner = web.AppRunner(station.create_app())
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"{host}:{bound_port}"
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    station = MockVodafoneStation(
+        lan_devices=args.lan_devices,
+        wlan_devices=args.wlan_devices,
+        guest_wlan_devices=args.guest_wlan_devices,
+        username=args.username,
+        password=args.password,
+    )
+    runner, address = await start_mock_station(station, args.host, args.port)
+    print(f"Mock Vodafone Station listening on http://{address}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--lan-devices", type=int, default=10)
+    parser.add_argument("--wlan-devices", type=int, default=10)
+    parser.add_argument("--guest-wlan-devices", type=int, default=0)
+    parser.add_argument("--username", default=DEFAULT_USERNAME)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    asyncio.run(_serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
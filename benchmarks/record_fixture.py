@@ -0,0 +1,101 @@
+"""Record a sanitized replay fixture from a Vodafone Station.
+
+Logs in, polls the device overview and logs out again while VodafoneBox
+records the responses. MACs keep their vendor prefix, hostnames and public
+addresses are replaced and the login secrets are re-encrypted for the
+fixture password, but review a fixture before sharing it.
+
+Run from the repository root with
+``python -m benchmarks.record_fixture --host 192.168.0.1 --firmware <version>``,
+or with ``--mock`` to record the mock station.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import getpass
+
+import aiohttp
+
+from custom_components.ha_vodafone_router.vodafone_box import VodafoneBox
+
+from .mock_station import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    MockVodafoneStation,
+    start_mock_station,
+)
+from .recording import TransportRecorder
+
+
+async def record(
+    host: str,
+    username: str,
+    password: str,
+    polls: int,
+    interval: float,
+    recorder: TransportRecorder,
+) -> None:
+    async with aiohttp.ClientSession(cookie_jar=aiohttp.DummyCookieJar()) as session:
+        box = VodafoneBox(host, session)
+        box.recorder = recorder
+        await box.async_login(username, password)
+        try:
+            for poll in range(polls):
+                if poll:
+                    await asyncio.sleep(interval)
+                devices = await box.async_get_connected_devices()
+                print(
+                    f"Poll {poll + 1}: "
+                    + ", ".join(f"{len(value)} {key}" for key, value in devices.items())
+                )
+        finally:
+            await box.async_logout()
+
+
+async def _run(args: argparse.Namespace) -> None:
+    recorder = TransportRecorder(args.firmware)
+    if args.mock:
+        station = MockVodafoneStation(
+            lan_devices=args.lan_devices, wlan_devices=args.wlan_devices
+        )
+        runner, address = await start_mock_station(station)
+        try:
+            await record(
+                address,
+                DEFAULT_USERNAME,
+                DEFAULT_PASSWORD,
+                args.polls,
+                args.interval,
+                recorder,
+            )
+        finally:
+            await runner.cleanup()
+    else:
+        password = args.password or getpass.getpass("Router password: ")
+        await record(
+            args.host, args.username, password, args.polls, args.interval, recorder
+        )
+
+    recorder.save(args.output)
+    print(f"Wrote {len(recorder.exchanges)} exchanges to {args.output}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="192.168.0.1")
+    parser.add_argument("--username", default=DEFAULT_USERNAME)
+    parser.add_argument("--password")
+    parser.add_argument("--firmware", help="Firmware version shown by the router")
+    parser.add_argument("--polls", type=int, default=3)
+    parser.add_argument("--interval", type=float, default=5.0)
+    parser.add_argument("--output", default="fixture.json")
+    parser.add_argument("--mock", action="store_true")
+    parser.add_argument("--lan-devices", type=int, default=10)
+    parser.add_argument("--wlan-devices", type=int, default=10)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""Record sanitized router responses to fixtures and replay them.
+
+VodafoneBox.recorder accepts the TransportRecorder, ReplaySession stands in
+for the aiohttp session of a box.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from http.cookies import SimpleCookie
+import ipaddress
+import json
+import logging
+import re
+from typing import Any
+
+import aiohttp
+from multidict import CIMultiDict
+
+from custom_components.ha_vodafone_router.const import (
+    DEVICE_PROPERTY_HOSTNAME,
+    DEVICE_PROPERTY_NAME,
+)
+from custom_components.ha_vodafone_router.poll_stats import LANDING_PAGE_ENDPOINT
+from custom_components.ha_vodafone_router.sjcl import SJCLContext
+
+_LOGGER = logging.getLogger(__name__)
+
+FIXTURE_VERSION = 1
+# Replayed logins succeed with this password, whatever the recorded one was
+FIXTURE_PASSWORD = "password"
+
+LOGIN_ENDPOINT = "ajaxSet_Password.php"
+SESSION_COOKIE = "PHPSESSID"
+
+# Response headers VodafoneBox acts on, everything else is dropped
+_RECORDED_HEADERS = ("Content-Type", "Location", "Retry-After")
+
+_MAC_PATTERN = re.compile(
+    r"\b[0-9A-Fa-f]{2}([:-])(?:[0-9A-Fa-f]{2}\1){4}[0-9A-Fa-f]{2}\b"
+)
+_IPV4_PATTERN = re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}\b")
+_IPV6_PATTERN = re.compile(
+    r"(?<![\w:])[0-9A-Fa-f]{0,4}(?::[0-9A-Fa-f]{0,4}){2,7}(?![\w:])"
+)
+_NAME_PATTERN = re.compile(
+    rf'("(?:{DEVICE_PROPERTY_HOSTNAME}|{DEVICE_PROPERTY_NAME}|Comment)"\s*:\s*)'
+    r'"((?:[^"\\]|\\.)*)"'
+)
+_IV_ASSIGNMENT = re.compile(r"(var myIv = ')(.+?)(';)")
+_SALT_ASSIGNMENT = re.compile(r"(var mySalt = ')(.+?)(';)")
+
+
+def endpoint_of(url: str) -> str:
+    """Return the endpoint name VodafoneBox uses for a request URL."""
+    if "/php/" not in url:
+        return LANDING_PAGE_ENDPOINT
+    return url.split("/php/", 1)[1].split("?", 1)[0]
+
+
+class FixtureSanitizer:
+    """Replace personal data and secrets in recorded responses.
+
+    MACs keep their vendor prefix, hostnames, public IPv4 and all IPv6
+    addresses are replaced by placeholders. The same value always maps to
+    the same placeholder, so devices keep their identity across polls. The
+    IV, salt and encrypted CSRF nonce are replaced with values derived from
+    FIXTURE_PASSWORD, so the recorded password cannot be attacked offline.
+    """
+
+    def __init__(self):
+        self._replacements: dict[tuple[str, str], str] = {}
+        self._counts: Counter[str] = Counter()
+        self._crypto: SJCLContext | None = None
+        self._iv: str | None = None
+        self._salt: str | None = None
+
+    def _placeholder(self, kind: str, value: str, make) -> str:
+        key = (kind, value)
+        if (replacement := self._replacements.get(key)) is None:
+            self._counts[kind] += 1
+            replacement = self._replacements[key] = make(self._counts[kind])
+        return replacement
+
+    def _mac(self, match: re.Match) -> str:
+        mac = match.group(0)
+        separator = match.group(1)
+
+        def make(index: int) -> str:
+            suffix = separator.join(f"{byte:02x}" for byte in index.to_bytes(3, "big"))
+            replacement = f"{mac[:9]}{suffix}"
+            return replacement.upper() if mac.isupper() else replacement.lower()
+
+        return self._placeholder("mac", mac.lower().replace("-", ":"), make)
+
+    def _ipv4(self, match: re.Match) -> str:
+        try:
+            address = ipaddress.IPv4Address(match.group(0))
+        except ValueError:
+            return match.group(0)
+        if not address.is_global:
+            return match.group(0)
+        return self._placeholder(
+            "ipv4", str(address), lambda index: f"203.0.113.{index % 254 + 1}"
+        )
+
+    def _ipv6(self, match: re.Match) -> str:
+        try:
+            address = ipaddress.IPv6Address(match.group(0))
+        except ValueError:
+            return match.group(0)
+        if address.is_loopback or address.is_unspecified:
+            return match.group(0)
+        return self._placeholder(
+            "ipv6", str(address), lambda index: f"2001:db8::{index:x}"
+        )
+
+    def _name(self, match: re.Match) -> str:
+        if not match.group(2):
+            return match.group(0)
+        name = self._placeholder(
+            "name", match.group(2), lambda index: f"device-{index}"
+        )
+        return f'{match.group(1)}"{name}"'
+
+    def session_id(self, session_id: str) -> str:
+        return self._placeholder("session", session_id, lambda index: f"{index:032x}")
+
+    def text(self, endpoint: str, text: str) -> str:
+        """Return the sanitized response body of an endpoint."""
+        if endpoint == LANDING_PAGE_ENDPOINT:
+            text = self._landing_page(text)
+        elif endpoint == LOGIN_ENDPOINT:
+            text = self._login_response(text)
+        text = _MAC_PATTERN.sub(self._mac, text)
+        text = _IPV6_PATTERN.sub(self._ipv6, text)
+        text = _IPV4_PATTERN.sub(self._ipv4, text)
+        return _NAME_PATTERN.sub(self._name, text)
+
+    def _landing_page(self, text: str) -> str:
+        if (iv := _IV_ASSIGNMENT.search(text)) and self._iv is None:
+            self._iv = "a5" * (len(iv.group(2)) // 2)
+        if (salt := _SALT_ASSIGNMENT.search(text)) and self._salt is None:
+            self._salt = "5a" * (len(salt.group(2)) // 2)
+        if self._iv:
+            text = _IV_ASSIGNMENT.sub(rf"\g<1>{self._iv}\g<3>", text)
+        if self._salt:
+            text = _SALT_ASSIGNMENT.sub(rf"\g<1>{self._salt}\g<3>", text)
+        return text
+
+    def _login_response(self, text: str) -> str:
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return text
+        if not isinstance(data, dict) or "encryptData" not in data:
+            return text
+        if not (self._iv and self._salt):
+            _LOGGER.warning("Login recorded without the landing page, dropping it")
+            data["encryptData"] = ""
+            return json.dumps(data)
+        if self._crypto is None:
+            self._crypto = SJCLContext.from_password(
+                FIXTURE_PASSWORD, self._salt, self._iv
+            )
+        data["encryptData"] = self._crypto.encrypt("0" * 32, "nonce")
+        return json.dumps(data)
+
+
+class TransportRecorder:
+    """Collect sanitized request and response pairs of a VodafoneBox.
+
+    Only the method and endpoint of a request are kept, the headers and
+    payloads sent to the router carry the session secrets.
+    """
+
+    def __init__(self, firmware: str | None = None):
+        self.firmware = firmware
+        self.exchanges: list[dict[str, Any]] = []
+        self._sanitizer = FixtureSanitizer()
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        response: aiohttp.ClientResponse,
+        text: str,
+        elapsed: float,
+    ) -> None:
+        cookies = {}
+        if (cookie := response.cookies.get(SESSION_COOKIE)) is not None:
+            cookies[SESSION_COOKIE] = self._sanitizer.session_id(cookie.value)
+        self.exchanges.append(
+            {
+                "method": method,
+                "endpoint": endpoint,
+                "status": response.status,
+                "elapsed": round(elapsed, 6),
+                "headers": {
+                    name: response.headers[name]
+                    for name in _RECORDED_HEADERS
+                    if name in response.headers
+                },
+                "cookies": cookies,
+                "body": self._sanitizer.text(endpoint, text),
+            }
+        )
+
+    def as_fixture(self) -> dict[str, Any]:
+        return {
+            "version": FIXTURE_VERSION,
+            "firmware": self.firmware,
+            "recorded_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "password": FIXTURE_PASSWORD,
+            "exchanges": self.exchanges,
+        }
+
+    def save(self, path: str) -> None:
+        """Write the recording to a JSON fixture file."""
+        with open(path, "w", encoding="utf-8") as fixture_file:
+            json.dump(self.as_fixture(), fixture_file, indent=1)
+        _LOGGER.debug("Saved %s exchanges to %s", len(self.exchanges), path)
+
+
+def load_fixture(path: str) -> dict[str, Any]:
+    """Read a fixture written by TransportRecorder.save."""
+    with open(path, encoding="utf-8") as fixture_file:
+        fixture = json.load(fixture_file)
+    if fixture.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"Unsupported fixture version in {path}")
+    return fixture
+
+
+class _ReplayContent:
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def iter_chunked(self, size: int) -> AsyncIterator[bytes]:
+        for start in range(0, len(self._body), size):
+            yield self._body[start : start + size]
+
+
+class ReplayResponse:
+    """The parts of aiohttp.ClientResponse used by VodafoneBox."""
+
+    charset = "utf-8"
+
+    def __init__(self, exchange: dict[str, Any]):
+        self.status: int = exchange["status"]
+        self.headers = CIMultiDict(exchange["headers"])
+        self.cookies: SimpleCookie = SimpleCookie()
+        for name, value in exchange["cookies"].items():
+            self.cookies[name] = value
+        self._body = exchange["body"].encode()
+        self.content = _ReplayContent(self._body)
+
+    async def read(self) -> bytes:
+        return self._body
+
+    def get_encoding(self) -> str:
+        return self.charset
+
+
+class _ReplayRequest:
+    def __init__(self, exchange: dict[str, Any], delay: float):
+        self._exchange = exchange
+        self._delay = delay
+
+    async def __aenter__(self) -> ReplayResponse:
+        if self._delay > 0:
+            await asyncio.sleep(self._delay)
+        return ReplayResponse(self._exchange)
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+class ReplaySession:
+    """Serve a recorded fixture in place of the aiohttp session of a box.
+
+    Responses are returned per method and endpoint in recorded order and
+    start over once exhausted, so a short recording can be polled any
+    number of times. Each response is delayed by its recorded latency
+    times time_scale, 0 replays without delay.
+    """
+
+    def __init__(self, fixture: dict[str, Any], time_scale: float = 1.0):
+        self.time_scale = time_scale
+        self.requests = 0
+        self._exchanges: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self._positions: dict[tuple[str, str], int] = {}
+        for exchange in fixture["exchanges"]:
+            self._exchanges.setdefault(
+                (exchange["method"], exchange["endpoint"]), []
+            ).append(exchange)
+
+    def _request(self, method: str, url: str) -> _ReplayRequest:
+        key = (method, endpoint_of(url))
+        if not (exchanges := self._exchanges.get(key)):
+            raise LookupError(f"No recorded response for {method} {key[1]}")
+        position = self._positions.get(key, 0)
+        self._positions[key] = (position + 1) % len(exchanges)
+        self.requests += 1
+        exchange = exchanges[position]
+        return _ReplayRequest(exchange, exchange["elapsed"] * self.time_scale)
+
+    def get(self, url: str, **kwargs) -> _ReplayRequest:
+        return self._request("GET", url)
+
+    def post(self, url: str, **kwargs) -> _ReplayRequest:
+        return self._request("POST", url)
@@ -0,0 +1,89 @@
+"""Hex string SJCL primitives.
+
+The integration works on bytes with ``sjcl.SJCLContext``. This is the hex
+interface it used before, kept for the mock station and as the baseline of
+the crypto benchmark.
+"""
+
+from __future__ import annotations
+
+import binascii
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESCCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from custom_components.ha_vodafone_router.sjcl import (
+    DEFAULT_SJCL_ITERATIONS,
+    DEFAULT_SJCL_KEYSIZEBITS,
+    DEFAULT_SJCL_TAGLENGTH,
+)
+
+
+class SJCL:
+    """Hex string interface to the SJCL primitives used by the router."""
+
+    DEFAULT_SJCL_ITERATIONS = DEFAULT_SJCL_ITERATIONS
+    DEFAULT_SJCL_KEYSIZEBITS = DEFAULT_SJCL_KEYSIZEBITS
+    DEFAULT_SJCL_TAGLENGTH = DEFAULT_SJCL_TAGLENGTH
+
+    @staticmethod
+    def pbkdf2(
+        password: str, salt_hex: str, iterations: int, key_size_bits: int
+    ) -> str:
+        salt = binascii.unhexlify(salt_hex)
+
+        kdf = PBKDF2HMAC(
+            algorithm=hashes.SHA256(),
+            length=key_size_bits // 8,
+            salt=salt,
+            iterations=iterations,
+            backend=default_backend(),
+        )
+
+        key = kdf.derive(password.encode())
+        return binascii.hexlify(key).decode()
+
+    @staticmethod
+    def ccm_encrypt(
+        derived_key_hex: str,
+        plaintext: str,
+        iv_hex: str,
+        auth_data: str,
+        tag_len_bits: int,
+    ) -> str:
+        key = binascii.unhexlify(derived_key_hex)
+        iv = binascii.unhexlify(iv_hex)
+
+        aesccm = AESCCM(key, tag_length=tag_len_bits // 8)
+
+        ciphertext = aesccm.encrypt(
+            iv,
+            plaintext.encode(),
+            auth_data.encode(),
+        )
+
+        return binascii.hexlify(ciphertext).decode()
+
+    @staticmethod
+    def ccm_decrypt(
+        derived_key_hex: str,
+        cipher_hex: str,
+        iv_hex: str,
+        auth_data: str,
+        tag_len_bits: int,
+    ) -> str:
+        key = binascii.unhexlify(derived_key_hex)
+        iv = binascii.unhexlify(iv_hex)
+        ciphertext = binascii.unhexlify(cipher_hex)
+
+        aesccm = AESCCM(key, tag_length=tag_len_bits // 8)
+
+        plaintext = aesccm.decrypt(
+            iv,
+            ciphertext,
+            auth_data.encode(),
+        )
+
+        return plaintext.decode()
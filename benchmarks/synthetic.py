@@ -0,0 +1,74 @@
+"""Synthetic router responses for benchmarks."""
+
+from __future__ import annotations
+
+import json
+import random
+from typing import Any
+
+_PAGE_PREAMBLE = """<script type="text/javascript">
+var json_overviewStatus = {"wanStatus": "up", "uptime": "12d 04h 17m"};
+var json_lanPortStatus = [{"port": 1, "link": "1000M"}, {"port": 2, "link": "down"}];
+"""
+
+_PAGE_EPILOGUE = """var js_wifiSummary = {"radios": 2};
+</script>
+"""
+
+
+def make_device(index: int, wireless: bool = False) -> dict[str, Any]:
+    """Return a device entry shaped like the router's attached device data."""
+    mac = ":".join(f"{byte:02X}" for byte in index.to_bytes(6, "big"))
+    device = {
+        "MAC": mac,
+        "HostName": f"device-{index}",
+        "IP": f"192.168.{index // 250 % 256}.{index % 250 + 2}",
+        "IPv6": f"fe80::{index:x}",
+        "Interface": "Ethernet" if not wireless else "WiFi",
+        "LeaseTime": "23:59:12",
+        "Comment": "",
+    }
+    if wireless:
+        device.update({"Band": "5G", "RSSI": f"-{40 + index % 40}", "Speed": "866"})
+    return device
+
+
+def make_overview_page(
+    lan_count: int, wlan_count: int, seed: int | None = None, guest_count: int = 0
+) -> str:
+    """Return an overview_data.php body with the given number of devices.
+
+    With a seed, some hostnames contain ';' to exercise the terminator
+    handling of the parser, and the page compares a device list with "=="
+    after assigning it. The guest WLAN list is only included when it has
+    devices, like on a router with the guest network disabled.
+    """
+    rng = random.Random(seed)
+    lan = [make_device(index) for index in range(lan_count)]
+    wlan = [
+        make_device(lan_count + index, wireless=True) for index in range(wlan_count)
+    ]
+    guest = [
+        make_device(lan_count + wlan_count + index, wireless=True)
+        for index in range(guest_count)
+    ]
+    if seed is not None:
+        for device in rng.sample(lan + wlan, k=min(3, len(lan) + len(wlan))):
+            device["HostName"] += ";guest"
+
+    return (
+        _PAGE_PREAMBLE
+        + f"var json_lanAttachedDevice = {json.dumps(lan)};\n"
+        + f"var json_primaryWlanAttachedDevice = {json.dumps(wlan)};\n"
+        + (
+            f"var json_guestWlanAttachedDevice = {json.dumps(guest)};\n"
+            if guest
+            else ""
+        )
+        + (
+            "if (json_lanAttachedDevice == null) { initOverview(); }\n"
+            if seed is not None
+            else ""
+        )
+        + _PAGE_EPILOGUE
+    )
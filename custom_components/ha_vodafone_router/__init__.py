@@ -1,24 +1,98 @@
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.const import Platform
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+    HomeAssistantError,
+    ServiceValidationError,
+)
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 import logging
+import voluptuous as vol
 
 from .const import (
+    ATTR_CYCLES,
+    ATTR_ENTRY_ID,
+    DEFAULT_CONSIDER_HOME,
+    DEFAULT_DEVICE_SOURCES,
+    DEFAULT_PROFILE_CYCLES,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     ENTRY_DATA_HOST,
     OPTION_PASSWORD,
     OPTION_SCAN_INTERVAL,
+    OPTION_ADAPTIVE_POLLING,
+    OPTION_MIN_SCAN_INTERVAL,
+    OPTION_MAX_SCAN_INTERVAL,
     OPTION_USERNAME,
     OPTION_MAC_FILTER,
+    OPTION_DEVICE_SOURCES,
+    OPTION_EXTRA_DEVICE_SOURCES,
+    OPTION_CONSIDER_HOME,
     OPTION_ENABLE_BINARY_SENSOR,
     OPTION_ENABLE_DEVICE_TRACKER,
+    SERVICE_PROFILE,
+    STORAGE_KEY_SESSION,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_VERSION,
 )
 from .coordinator import VodafoneDeviceCoordinator
+from .broker import async_get_session_broker
+from .exceptions import AuthenticationError
+from .sources import parse_device_sources
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=50)
+        ),
+    }
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the services and websocket commands of the integration."""
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the next update cycles of one or all routers."""
+        coordinators: dict[str, VodafoneDeviceCoordinator] = hass.data.get(DOMAIN, {})
+        if entry_id := call.data.get(ATTR_ENTRY_ID):
+            if entry_id not in coordinators:
+                raise ServiceValidationError(
+                    f"No loaded Vodafone Station entry with id {entry_id}"
+                )
+            coordinators = {entry_id: coordinators[entry_id]}
+
+        # Check every router first, so a busy one does not leave the others
+        # profiling without a response
+        if busy := [
+            entry_id
+            for entry_id, coordinator in coordinators.items()
+            if coordinator.profiler is not None
+        ]:
+            raise HomeAssistantError(
+                f"Profiling is already in progress for {', '.join(busy)}"
+            )
+        for coordinator in coordinators.values():
+            coordinator.async_start_profiling(call.data[ATTR_CYCLES])
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
+    async_register_websocket_commands(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Vodafone Station integration from a config entry."""
@@ -31,15 +105,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     password = entry.options.get(OPTION_PASSWORD)
     scan_interval = entry.options.get(OPTION_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     mac_filter = entry.options.get(OPTION_MAC_FILTER, "")
+    consider_home = entry.options.get(OPTION_CONSIDER_HOME, DEFAULT_CONSIDER_HOME)
+    device_sources = parse_device_sources(
+        entry.options.get(OPTION_DEVICE_SOURCES, DEFAULT_DEVICE_SOURCES),
+        entry.options.get(OPTION_EXTRA_DEVICE_SOURCES, ""),
+    )
+    adaptive_polling = entry.options.get(OPTION_ADAPTIVE_POLLING, False)
+    min_scan_interval = entry.options.get(
+        OPTION_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+    )
+    max_scan_interval = entry.options.get(
+        OPTION_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+    )
     enable_binary_sensor = entry.options.get(OPTION_ENABLE_BINARY_SENSOR, True)
     enable_device_tracker = entry.options.get(OPTION_ENABLE_DEVICE_TRACKER, True)
 
     _LOGGER.debug(
-        "Configuration: host=%s, username=%s, scan_interval=%s, mac_filter=%s, platforms=bs:%s dt:%s",
+        "Configuration: host=%s, username=%s, scan_interval=%s, adaptive=%s (%s-%s), mac_filter=%s, sources=%s, platforms=bs:%s dt:%s",
         host,
         username,
         scan_interval,
+        adaptive_polling,
+        min_scan_interval,
+        max_scan_interval,
         mac_filter,
+        [f"{source.endpoint}:{source.array}" for source in device_sources],
         enable_binary_sensor,
         enable_device_tracker,
     )
@@ -57,25 +147,62 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "No platforms enabled - at least one platform must be selected"
         )
 
+    # Poll diagnostic sensors are always set up but disabled by default
+    platforms.append(Platform.SENSOR)
+
     _LOGGER.info("Enabled platforms: %s", [p.value for p in platforms])
 
     coordinator = VodafoneDeviceCoordinator(
         hass,
+        entry,
         host=host,
         username=username,
         password=password,
         scan_interval=scan_interval,
         mac_filter=mac_filter,
+        device_sources=device_sources,
+        consider_home=consider_home,
+        adaptive_polling=adaptive_polling,
+        min_scan_interval=min_scan_interval,
+        max_scan_interval=max_scan_interval,
+        broker=async_get_session_broker(hass),
     )
-
-    try:
-        _LOGGER.debug("Attempting initial login and data refresh")
-        await coordinator.async_login()
-        await coordinator.async_config_entry_first_refresh()
-        _LOGGER.info("Initial connection and data refresh successful")
-    except Exception as err:
-        _LOGGER.error("Failed to connect to Vodafone Station: %s", err, exc_info=True)
-        raise ConfigEntryNotReady(f"Cannot connect to Vodafone Station: {err}") from err
+    # Websocket subscriptions end with the entry, also when it reloads
+    entry.async_on_unload(coordinator.async_end_delta_listeners)
+    entry.async_on_unload(coordinator.async_track_new_day())
+    # Saved options only apply to a newly set up coordinator
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    if await coordinator.async_load_snapshot():
+        # Entities are created from the last known devices right away, the
+        # router is contacted in the background
+        _LOGGER.debug("Connecting to Vodafone Station in the background")
+        entry.async_create_background_task(
+            hass, coordinator.async_start(), f"{DOMAIN} start {entry.entry_id}"
+        )
+    else:
+        try:
+            _LOGGER.debug("Attempting initial login and data refresh")
+            if not await coordinator.async_restore_session():
+                await coordinator.async_login()
+                await coordinator.async_config_entry_first_refresh()
+            _LOGGER.info("Initial connection and data refresh successful")
+        except ConfigEntryAuthFailed:
+            coordinator.async_release_session()
+            raise
+        except AuthenticationError as err:
+            coordinator.async_release_session()
+            raise ConfigEntryAuthFailed(
+                f"Vodafone Station refused the credentials: {err}"
+            ) from err
+        except Exception as err:
+            _LOGGER.error(
+                "Failed to connect to Vodafone Station: %s", err, exc_info=True
+            )
+            coordinator.async_release_session()
+            raise ConfigEntryNotReady(
+                f"Cannot connect to Vodafone Station: {err}"
+            ) from err
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
     _LOGGER.debug("Setting up platforms: %s", [p.value for p in platforms])
@@ -89,15 +216,6 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry and logout from the Vodafone Station."""
     _LOGGER.info("Unloading Vodafone Station integration for entry: %s", entry.entry_id)
 
-    coordinator: VodafoneDeviceCoordinator = hass.data[DOMAIN][entry.entry_id]
-
-    try:
-        _LOGGER.debug("Attempting to logout from Vodafone Station")
-        await coordinator.async_logout()
-        _LOGGER.info("Successfully logged out from Vodafone Station")
-    except Exception as err:
-        _LOGGER.warning("Failed to logout from Vodafone Station: %s", err)
-
     # Determine which platforms were loaded
     enable_binary_sensor = entry.options.get(OPTION_ENABLE_BINARY_SENSOR, True)
     enable_device_tracker = entry.options.get(OPTION_ENABLE_DEVICE_TRACKER, True)
@@ -107,18 +225,31 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         platforms.append(Platform.BINARY_SENSOR)
     if enable_device_tracker:
         platforms.append(Platform.DEVICE_TRACKER)
+    platforms.append(Platform.SENSOR)
 
     # Unload platforms
     _LOGGER.debug("Unloading platforms: %s", [p.value for p in platforms])
     unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
 
-    if unload_ok:
-        _LOGGER.debug("Platforms unloaded successfully")
-    else:
+    if not unload_ok:
         _LOGGER.warning("Some platforms failed to unload")
+        return False
+    _LOGGER.debug("Platforms unloaded successfully")
 
-    # Remove from hass.data
-    hass.data[DOMAIN].pop(entry.entry_id, None)
+    # The broker logs out once no flow or entry uses the session anymore
+    coordinator: VodafoneDeviceCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+    coordinator.async_release_session()
     _LOGGER.info("Vodafone Station integration unloaded")
 
-    return unload_ok
+    return True
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options were saved."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the data persisted for a deleted config entry."""
+    for key in (STORAGE_KEY_SESSION, STORAGE_KEY_SNAPSHOT):
+        await Store(hass, STORAGE_VERSION, f"{key}.{entry.entry_id}").async_remove()
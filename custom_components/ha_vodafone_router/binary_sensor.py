@@ -3,19 +3,13 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from voluptuous import Any
-from .const import (
-    DEVICE_PROPERTY_HOSTNAME,
-    DEVICE_PROPERTY_MAC_ADDRESS,
-    DEVICE_PROPERTY_NAME,
-    DOMAIN,
-    ROUTER_PROPERTY_LAN_DEVICES,
-    ROUTER_PROPERTY_WLAN_DEVICES,
-)
+from .const import DOMAIN, PRESENCE_ATTRIBUTES
 from .coordinator import VodafoneDeviceCoordinator
+from .models import Device
 import logging
+from typing import Any
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,52 +29,47 @@ async def async_setup_entry(
 
     _LOGGER.debug("Creating binary sensor entities from connected devices")
     sensors = []
-    total_devices = 0
 
-    for dev_list_name in [ROUTER_PROPERTY_LAN_DEVICES, ROUTER_PROPERTY_WLAN_DEVICES]:
-        devices = coordinator.data.get(dev_list_name, [])
+    for device in coordinator.data.devices.values():
         _LOGGER.debug(
-            "Processing %s devices from %s for binary sensors",
-            len(devices),
-            dev_list_name,
+            "Creating binary sensor for device: %s (%s)",
+            device.hostname or "Unknown",
+            device.mac,
         )
-
-        for device in devices:
-            total_devices += 1
-            if not device.get(DEVICE_PROPERTY_MAC_ADDRESS):
-                _LOGGER.warning("Skipping device without MAC address: %s", device)
-                continue
-
-            _LOGGER.debug(
-                "Creating binary sensor for device: %s (%s)",
-                device.get(DEVICE_PROPERTY_HOSTNAME, "Unknown"),
-                device.get(DEVICE_PROPERTY_MAC_ADDRESS),
-            )
-            sensors.append(VodafoneDeviceBinarySensor(coordinator, device))
+        sensors.append(VodafoneDeviceBinarySensor(coordinator, device))
 
     _LOGGER.info(
         "Created %s binary sensor entities from %s total devices",
         len(sensors),
-        total_devices,
+        len(coordinator.data.devices),
     )
     async_add_entities(sensors)
 
+    @callback
+    def async_add_new_devices(devices: list[Device]) -> None:
+        """Add entities for devices that connected after setup."""
+        _LOGGER.debug("Adding %s entities for new devices", len(devices))
+        async_add_entities(
+            [VodafoneDeviceBinarySensor(coordinator, device) for device in devices]
+        )
+
+    entry.async_on_unload(
+        coordinator.async_add_new_devices_listener(async_add_new_devices)
+    )
+
 
 class VodafoneDeviceBinarySensor(BinarySensorEntity):
     """Binary sensor representing a Vodafone Station connected device."""
 
     _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    # State is written by the coordinator for changed devices only
+    _attr_should_poll = False
+    _unrecorded_attributes = PRESENCE_ATTRIBUTES
 
-    def __init__(self, coordinator: VodafoneDeviceCoordinator, device: dict[str, Any]):
+    def __init__(self, coordinator: VodafoneDeviceCoordinator, device: Device):
         self.coordinator = coordinator
-        self.device = device
-        self.mac = device.get(DEVICE_PROPERTY_MAC_ADDRESS)
-        self.name = (
-            device.get(DEVICE_PROPERTY_HOSTNAME)
-            or device.get(DEVICE_PROPERTY_NAME)
-            or self.mac
-        )
-        # MAC is guaranteed here because we filtered earlier
+        self.mac = device.mac
+        self.name = device.name
         self._attr_name = f"{self.name} Sensor"
         self._attr_unique_id = f"vodafone_{self.mac.replace(':', '')}_sensor"
 
@@ -94,17 +83,7 @@ class VodafoneDeviceBinarySensor(BinarySensorEntity):
     @property
     def is_on(self) -> bool:
         """Return True if device is connected."""
-        connected_macs = {
-            d.get(DEVICE_PROPERTY_MAC_ADDRESS)
-            for d in self.coordinator.data.get(ROUTER_PROPERTY_LAN_DEVICES, [])
-        }
-        connected_macs.update(
-            {
-                d.get(DEVICE_PROPERTY_MAC_ADDRESS)
-                for d in self.coordinator.data.get(ROUTER_PROPERTY_WLAN_DEVICES, [])
-            }
-        )
-        is_connected = self.mac in connected_macs
+        is_connected = self.coordinator.data.is_connected(self.mac)
         _LOGGER.debug(
             "Binary sensor %s (%s) state: %s",
             self._attr_name,
@@ -113,8 +92,15 @@ class VodafoneDeviceBinarySensor(BinarySensorEntity):
         )
         return is_connected
 
-    async def async_update(self) -> None:
-        await self.coordinator.async_request_refresh()
+    @property
+    def available(self) -> bool:
+        """Return False while restored devices could not be confirmed."""
+        return self.coordinator.devices_available
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return presence statistics kept by the coordinator."""
+        return self.coordinator.async_presence_attributes(self.mac)
 
     async def async_added_to_hass(self) -> None:
         """Register for coordinator updates."""
@@ -122,7 +108,9 @@ class VodafoneDeviceBinarySensor(BinarySensorEntity):
             "Adding binary sensor %s (%s) to Home Assistant", self._attr_name, self.mac
         )
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_device_listener(
+                self.mac, self.async_write_ha_state
+            )
         )
         _LOGGER.debug(
             "Registered binary sensor %s for coordinator updates", self._attr_name
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+
+import aiohttp
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.event import async_call_later
+
+from .const import DATA_POLLING_HUB, DATA_SESSION_BROKER, SESSION_LINGER
+from .hub import VodafonePollingHub
+from .vodafone_box import VodafoneBox
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def async_create_vodafone_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Create a client session on Home Assistant's shared connector.
+
+    The router session cookie is managed by VodafoneBox, so the cookie jar is
+    disabled to keep routers on the same instance from seeing each other's
+    PHPSESSID. That also lets every box share the one session of the broker.
+    """
+    return async_create_clientsession(hass, cookie_jar=aiohttp.DummyCookieJar())
+
+
+@callback
+def async_get_session_broker(hass: HomeAssistant) -> VodafoneSessionBroker:
+    """Return the session broker shared by all flows and config entries."""
+    if (broker := hass.data.get(DATA_SESSION_BROKER)) is None:
+        broker = hass.data[DATA_SESSION_BROKER] = VodafoneSessionBroker(
+            hass, hass.data.setdefault(DATA_POLLING_HUB, VodafonePollingHub())
+        )
+    return broker
+
+
+@dataclass(slots=True)
+class _SharedSession:
+    box: VodafoneBox
+    users: int = 0
+    cancel_logout: CALLBACK_TYPE | None = None
+    # Run after the logout, e.g. to remove a persisted copy of the session
+    logout_callbacks: list[Callable[[], Awaitable[None]]] = field(default_factory=list)
+
+
+class SessionLease:
+    """A borrowed router session, release it once it is no longer used."""
+
+    def __init__(
+        self, broker: VodafoneSessionBroker, key: tuple[str, str, str], box: VodafoneBox
+    ):
+        self.box = box
+        self._broker = broker
+        self._key = key
+        self._released = False
+
+    @callback
+    def release(self, on_logout: Callable[[], Awaitable[None]] | None = None) -> None:
+        """Hand the session back, on_logout is awaited once it is logged out."""
+        if not self._released:
+            self._released = True
+            self._broker._release(self._key, on_logout)
+
+
+class VodafoneSessionBroker:
+    """Share one logged in VodafoneBox per router and credentials.
+
+    The config and options flows borrow a session to validate credentials
+    and the coordinator set up right after inherits it, instead of each
+    leaving a session behind on the router. A session is logged out
+    SESSION_LINGER seconds after its last user released it, unless it is
+    borrowed again in the meantime. All boxes use one client session, so
+    dropped boxes, e.g. of failed login attempts, leave nothing behind.
+
+    Config entries for the same router and credentials share one box, with
+    its key cache and request statistics.
+    """
+
+    def __init__(self, hass: HomeAssistant, hub: VodafonePollingHub):
+        self.hass = hass
+        self.hub = hub
+        self.client_session = async_create_vodafone_session(hass)
+        self._sessions: dict[tuple[str, str, str], _SharedSession] = {}
+
+    @callback
+    def acquire(self, host: str, username: str, password: str) -> SessionLease:
+        """Borrow the session for host, creating a box if there is none.
+
+        The box is not logged in yet if is_logged_in is False.
+        """
+        key = (host, username, password)
+        if (shared := self._sessions.get(key)) is None:
+            _LOGGER.debug("Creating router session for %s", host)
+            shared = self._sessions[key] = _SharedSession(
+                VodafoneBox(
+                    host,
+                    self.client_session,
+                    self.hub.limiter(host),
+                )
+            )
+        elif shared.cancel_logout is not None:
+            _LOGGER.debug("Reusing lingering router session for %s", host)
+            shared.cancel_logout()
+            shared.cancel_logout = None
+            # The session lives on, so do persisted copies of it
+            shared.logout_callbacks.clear()
+
+        shared.users += 1
+        return SessionLease(self, key, shared.box)
+
+    @callback
+    def _release(
+        self,
+        key: tuple[str, str, str],
+        on_logout: Callable[[], Awaitable[None]] | None,
+    ) -> None:
+        shared = self._sessions[key]
+        if on_logout is not None:
+            shared.logout_callbacks.append(on_logout)
+        shared.users -= 1
+        if shared.users:
+            return
+
+        @callback
+        def _logout_unused(_now: datetime) -> None:
+            shared.cancel_logout = None
+            del self._sessions[key]
+            self.hass.async_create_background_task(
+                self._async_logout(shared), f"vodafone logout {key[0]}"
+            )
+
+        shared.cancel_logout = async_call_later(
+            self.hass, SESSION_LINGER, _logout_unused
+        )
+
+    async def _async_logout(self, shared: _SharedSession) -> None:
+        box = shared.box
+        if box.is_logged_in:
+            _LOGGER.info("Logging out unused router session for %s", box.host)
+            try:
+                await box.async_logout()
+            except Exception as err:
+                _LOGGER.warning("Failed to logout from Vodafone Station: %s", err)
+        for on_logout in shared.logout_callbacks:
+            await on_logout()
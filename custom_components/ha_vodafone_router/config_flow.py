@@ -1,21 +1,68 @@
 import voluptuous as vol
 import logging
 from homeassistant import config_entries
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from .const import (
     DOMAIN,
     ENTRY_DATA_HOST,
     OPTION_PASSWORD,
     OPTION_USERNAME,
     OPTION_MAC_FILTER,
+    OPTION_DEVICE_SOURCES,
+    OPTION_EXTRA_DEVICE_SOURCES,
+    OPTION_CONSIDER_HOME,
     OPTION_ENABLE_BINARY_SENSOR,
     OPTION_ENABLE_DEVICE_TRACKER,
     OPTION_SCAN_INTERVAL,
+    OPTION_ADAPTIVE_POLLING,
+    OPTION_MIN_SCAN_INTERVAL,
+    OPTION_MAX_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_DEVICE_SOURCES,
+    DEFAULT_CONSIDER_HOME,
+    DEVICE_SOURCE_LAN,
+    DEVICE_SOURCE_PRIMARY_WLAN,
+    DEVICE_SOURCE_GUEST_WLAN,
 )
-from .vodafone_box import VodafoneBox
+from .broker import async_get_session_broker
+from .exceptions import AuthenticationError
+from .mac_filter import invalid_mac_filter_entries
+from .sources import parse_extra_device_source
 
 _LOGGER = logging.getLogger(__name__)
 
+DEVICE_SOURCE_LABELS = {
+    DEVICE_SOURCE_LAN: "LAN",
+    DEVICE_SOURCE_PRIMARY_WLAN: "Primary WLAN",
+    DEVICE_SOURCE_GUEST_WLAN: "Guest WLAN",
+}
+
+
+async def _async_validate_login(
+    hass: HomeAssistant, host: str, username: str, password: str
+) -> None:
+    """Log in through the session broker, raising if the router refuses.
+
+    A session already held for the same credentials is reused. The session
+    is released right away and lingers for the entry set up next.
+    """
+    lease = async_get_session_broker(hass).acquire(host, username, password)
+    try:
+        if not lease.box.is_logged_in:
+            await lease.box.async_login(username, password)
+    finally:
+        lease.release()
+
+
+def _invalid_device_sources(extra_sources: str) -> bool:
+    return any(
+        entry.strip() and parse_extra_device_source(entry) is None
+        for entry in extra_sources.split(",")
+    )
+
 
 class VodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Vodafone Station."""
@@ -38,9 +85,21 @@ class VodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             username = user_input[OPTION_USERNAME]
             password = user_input[OPTION_PASSWORD]
             mac_filter = user_input.get(OPTION_MAC_FILTER, "")
+            device_sources = user_input.get(
+                OPTION_DEVICE_SOURCES, DEFAULT_DEVICE_SOURCES
+            )
+            extra_device_sources = user_input.get(OPTION_EXTRA_DEVICE_SOURCES, "")
+            consider_home = user_input.get(OPTION_CONSIDER_HOME, DEFAULT_CONSIDER_HOME)
             enable_binary_sensor = user_input.get(OPTION_ENABLE_BINARY_SENSOR, True)
             enable_device_tracker = user_input.get(OPTION_ENABLE_DEVICE_TRACKER, True)
             scan_interval = user_input.get(OPTION_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            adaptive_polling = user_input.get(OPTION_ADAPTIVE_POLLING, False)
+            min_scan_interval = user_input.get(
+                OPTION_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+            )
+            max_scan_interval = user_input.get(
+                OPTION_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+            )
 
             _LOGGER.debug(
                 "Testing connection to Vodafone Station at %s with username %s",
@@ -48,29 +107,43 @@ class VodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 username,
             )
 
-            box = VodafoneBox(host)
-            try:
-                await self.hass.async_add_executor_job(box.login, username, password)
-                _LOGGER.info("Connection test successful for %s", host)
-            except Exception as e:
-                _LOGGER.error(
-                    "Connection test failed for %s: %s", host, e, exc_info=True
-                )
-                errors["base"] = "cannot_connect"
+            if min_scan_interval > max_scan_interval:
+                errors["base"] = "invalid_scan_interval_bounds"
+            elif invalid_mac_filter_entries(mac_filter):
+                errors["base"] = "invalid_mac_filter"
+            elif _invalid_device_sources(extra_device_sources):
+                errors["base"] = "invalid_device_source"
             else:
-                _LOGGER.info("Creating config entry for Vodafone Station at %s", host)
-                return self.async_create_entry(
-                    title=f"Vodafone Station ({host})",
-                    data={ENTRY_DATA_HOST: host},  # non-sensitive
-                    options={
-                        OPTION_USERNAME: username,
-                        OPTION_PASSWORD: password,
-                        OPTION_MAC_FILTER: mac_filter,
-                        OPTION_ENABLE_BINARY_SENSOR: enable_binary_sensor,
-                        OPTION_ENABLE_DEVICE_TRACKER: enable_device_tracker,
-                        OPTION_SCAN_INTERVAL: scan_interval,
-                    },
-                )
+                try:
+                    await _async_validate_login(self.hass, host, username, password)
+                    _LOGGER.info("Connection test successful for %s", host)
+                except Exception as e:
+                    _LOGGER.error(
+                        "Connection test failed for %s: %s", host, e, exc_info=True
+                    )
+                    errors["base"] = "cannot_connect"
+                else:
+                    _LOGGER.info(
+                        "Creating config entry for Vodafone Station at %s", host
+                    )
+                    return self.async_create_entry(
+                        title=f"Vodafone Station ({host})",
+                        data={ENTRY_DATA_HOST: host},  # non-sensitive
+                        options={
+                            OPTION_USERNAME: username,
+                            OPTION_PASSWORD: password,
+                            OPTION_MAC_FILTER: mac_filter,
+                            OPTION_DEVICE_SOURCES: device_sources,
+                            OPTION_EXTRA_DEVICE_SOURCES: extra_device_sources,
+                            OPTION_CONSIDER_HOME: consider_home,
+                            OPTION_ENABLE_BINARY_SENSOR: enable_binary_sensor,
+                            OPTION_ENABLE_DEVICE_TRACKER: enable_device_tracker,
+                            OPTION_SCAN_INTERVAL: scan_interval,
+                            OPTION_ADAPTIVE_POLLING: adaptive_polling,
+                            OPTION_MIN_SCAN_INTERVAL: min_scan_interval,
+                            OPTION_MAX_SCAN_INTERVAL: max_scan_interval,
+                        },
+                    )
 
         schema = vol.Schema(
             {
@@ -78,18 +151,74 @@ class VodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(OPTION_USERNAME): str,
                 vol.Required(OPTION_PASSWORD): str,
                 vol.Optional(OPTION_MAC_FILTER, default=""): str,
+                vol.Optional(
+                    OPTION_DEVICE_SOURCES, default=DEFAULT_DEVICE_SOURCES
+                ): cv.multi_select(DEVICE_SOURCE_LABELS),
+                vol.Optional(OPTION_EXTRA_DEVICE_SOURCES, default=""): str,
+                vol.Optional(
+                    OPTION_CONSIDER_HOME, default=DEFAULT_CONSIDER_HOME
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1800)),
                 vol.Optional(OPTION_ENABLE_BINARY_SENSOR, default=True): bool,
                 vol.Optional(OPTION_ENABLE_DEVICE_TRACKER, default=True): bool,
                 vol.Optional(
                     OPTION_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
                 ): vol.All(vol.Coerce(int), vol.Range(min=10, max=600)),
+                vol.Optional(OPTION_ADAPTIVE_POLLING, default=False): bool,
+                vol.Optional(
+                    OPTION_MIN_SCAN_INTERVAL, default=DEFAULT_MIN_SCAN_INTERVAL
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=600)),
+                vol.Optional(
+                    OPTION_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
             }
         )
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
 
-    async def async_step_reauth(self, user_input=None):
-        """Handle re-authentication when login fails."""
-        return await self.async_step_user(user_input)
+    async def async_step_reauth(self, entry_data):
+        """Handle re-authentication when the router refuses the credentials."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        """Ask for new credentials and reload the entry with them."""
+        entry = self._get_reauth_entry()
+        errors = {}
+
+        if user_input is not None:
+            username = user_input[OPTION_USERNAME]
+            password = user_input[OPTION_PASSWORD]
+            try:
+                await _async_validate_login(
+                    self.hass, entry.data[ENTRY_DATA_HOST], username, password
+                )
+            except AuthenticationError:
+                errors["base"] = "invalid_auth"
+            except Exception as e:
+                _LOGGER.error("Re-authentication failed: %s", e, exc_info=True)
+                errors["base"] = "cannot_connect"
+            else:
+                return self.async_update_reload_and_abort(
+                    entry,
+                    options={
+                        **entry.options,
+                        OPTION_USERNAME: username,
+                        OPTION_PASSWORD: password,
+                    },
+                )
+
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    OPTION_USERNAME, default=entry.options.get(OPTION_USERNAME, "")
+                ): str,
+                vol.Required(OPTION_PASSWORD): str,
+            }
+        )
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=schema,
+            errors=errors,
+            description_placeholders={"host": entry.data[ENTRY_DATA_HOST]},
+        )
 
 
 class VodafoneOptionsFlow(config_entries.OptionsFlow):
@@ -106,31 +235,62 @@ class VodafoneOptionsFlow(config_entries.OptionsFlow):
             username = user_input[OPTION_USERNAME]
             password = user_input[OPTION_PASSWORD]
 
-            box = VodafoneBox(host)
-            try:
-                await self.hass.async_add_executor_job(box.login, username, password)
-                _LOGGER.info("Options connection test successful")
+            min_scan_interval = user_input.get(
+                OPTION_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+            )
+            max_scan_interval = user_input.get(
+                OPTION_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+            )
 
-                return self.async_create_entry(
-                    title="",
-                    data={
-                        OPTION_USERNAME: username,
-                        OPTION_PASSWORD: password,
-                        OPTION_MAC_FILTER: user_input[OPTION_MAC_FILTER],
-                        OPTION_ENABLE_BINARY_SENSOR: user_input[
-                            OPTION_ENABLE_BINARY_SENSOR
-                        ],
-                        OPTION_ENABLE_DEVICE_TRACKER: user_input[
-                            OPTION_ENABLE_DEVICE_TRACKER
-                        ],
-                        OPTION_SCAN_INTERVAL: user_input.get(
-                            OPTION_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-                        ),
-                    },
-                )
-            except Exception as e:
-                _LOGGER.error("Options connection test failed: %s", e, exc_info=True)
-                errors["base"] = "cannot_connect"
+            if min_scan_interval > max_scan_interval:
+                errors["base"] = "invalid_scan_interval_bounds"
+            elif invalid_mac_filter_entries(user_input.get(OPTION_MAC_FILTER, "")):
+                errors["base"] = "invalid_mac_filter"
+            elif _invalid_device_sources(
+                user_input.get(OPTION_EXTRA_DEVICE_SOURCES, "")
+            ):
+                errors["base"] = "invalid_device_source"
+            else:
+                try:
+                    await _async_validate_login(self.hass, host, username, password)
+                    _LOGGER.info("Options connection test successful")
+
+                    return self.async_create_entry(
+                        title="",
+                        data={
+                            OPTION_USERNAME: username,
+                            OPTION_PASSWORD: password,
+                            OPTION_MAC_FILTER: user_input[OPTION_MAC_FILTER],
+                            OPTION_DEVICE_SOURCES: user_input.get(
+                                OPTION_DEVICE_SOURCES, DEFAULT_DEVICE_SOURCES
+                            ),
+                            OPTION_EXTRA_DEVICE_SOURCES: user_input.get(
+                                OPTION_EXTRA_DEVICE_SOURCES, ""
+                            ),
+                            OPTION_CONSIDER_HOME: user_input.get(
+                                OPTION_CONSIDER_HOME, DEFAULT_CONSIDER_HOME
+                            ),
+                            OPTION_ENABLE_BINARY_SENSOR: user_input[
+                                OPTION_ENABLE_BINARY_SENSOR
+                            ],
+                            OPTION_ENABLE_DEVICE_TRACKER: user_input[
+                                OPTION_ENABLE_DEVICE_TRACKER
+                            ],
+                            OPTION_SCAN_INTERVAL: user_input.get(
+                                OPTION_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+                            ),
+                            OPTION_ADAPTIVE_POLLING: user_input.get(
+                                OPTION_ADAPTIVE_POLLING, False
+                            ),
+                            OPTION_MIN_SCAN_INTERVAL: min_scan_interval,
+                            OPTION_MAX_SCAN_INTERVAL: max_scan_interval,
+                        },
+                    )
+                except Exception as e:
+                    _LOGGER.error(
+                        "Options connection test failed: %s", e, exc_info=True
+                    )
+                    errors["base"] = "cannot_connect"
 
         current_options = self.config_entry.options
 
@@ -146,6 +306,22 @@ class VodafoneOptionsFlow(config_entries.OptionsFlow):
                     OPTION_MAC_FILTER,
                     default=current_options.get(OPTION_MAC_FILTER, ""),
                 ): str,
+                vol.Optional(
+                    OPTION_DEVICE_SOURCES,
+                    default=current_options.get(
+                        OPTION_DEVICE_SOURCES, DEFAULT_DEVICE_SOURCES
+                    ),
+                ): cv.multi_select(DEVICE_SOURCE_LABELS),
+                vol.Optional(
+                    OPTION_EXTRA_DEVICE_SOURCES,
+                    default=current_options.get(OPTION_EXTRA_DEVICE_SOURCES, ""),
+                ): str,
+                vol.Optional(
+                    OPTION_CONSIDER_HOME,
+                    default=current_options.get(
+                        OPTION_CONSIDER_HOME, DEFAULT_CONSIDER_HOME
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1800)),
                 vol.Optional(
                     OPTION_ENABLE_BINARY_SENSOR,
                     default=current_options.get(OPTION_ENABLE_BINARY_SENSOR, True),
@@ -160,6 +336,22 @@ class VodafoneOptionsFlow(config_entries.OptionsFlow):
                         OPTION_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     ),
                 ): vol.All(vol.Coerce(int), vol.Range(min=10, max=600)),
+                vol.Optional(
+                    OPTION_ADAPTIVE_POLLING,
+                    default=current_options.get(OPTION_ADAPTIVE_POLLING, False),
+                ): bool,
+                vol.Optional(
+                    OPTION_MIN_SCAN_INTERVAL,
+                    default=current_options.get(
+                        OPTION_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=600)),
+                vol.Optional(
+                    OPTION_MAX_SCAN_INTERVAL,
+                    default=current_options.get(
+                        OPTION_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
             }
         )
 
@@ -1,17 +1,92 @@
 DOMAIN = "vodafone_router_device_polling"
 
 DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_MIN_SCAN_INTERVAL = 10
+DEFAULT_MAX_SCAN_INTERVAL = 300
+# Seconds a device must be missing before it is reported away
+DEFAULT_CONSIDER_HOME = 180
+
+# Adaptive polling stretches the interval by this factor per unchanged poll
+ADAPTIVE_BACKOFF_FACTOR = 1.5
+ADAPTIVE_JITTER = 0.1
+
+# Shared by all config entries to spread load across routers
+DATA_POLLING_HUB = f"{DOMAIN}_polling_hub"
+MAX_CONCURRENT_REQUESTS = 4
+MAX_CONCURRENT_REQUESTS_PER_HOST = 2
+POLL_START_SPACING = 2
+
+# Router sessions outlive their last user by this many seconds, so the
+# entry set up after a config flow inherits the flow's session
+DATA_SESSION_BROKER = f"{DOMAIN}_session_broker"
+SESSION_LINGER = 30
+
+# Transient router errors are retried within one update, at most this many
+# times and sleeping no longer than the budget in total
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+RETRY_OVERLOAD_BACKOFF = 2
+RETRY_BUDGET = 8
+
+SERVICE_PROFILE = "profile"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_CYCLES = "cycles"
+DEFAULT_PROFILE_CYCLES = 3
+
+# Fired once per update with every device that joined or left
+EVENT_DEVICE_JOINED = "vodafone_device_joined"
+EVENT_DEVICE_LEFT = "vodafone_device_left"
+ATTR_DEVICES = "devices"
+ATTR_HOST = "host"
+
+WS_TYPE_SUBSCRIBE_DEVICES = f"{DOMAIN}/subscribe_devices"
+
+# Presence statistics state attributes of device entities
+ATTR_CONNECTED_SINCE = "connected_since"
+ATTR_LAST_LEFT = "last_left"
+ATTR_LAST_SEEN = "last_seen"
+ATTR_CONNECTED_TODAY = "connected_today"
+ATTR_SESSION_COUNT = "session_count"
+PRESENCE_ATTRIBUTES = frozenset(
+    {
+        ATTR_CONNECTED_SINCE,
+        ATTR_LAST_LEFT,
+        ATTR_LAST_SEEN,
+        ATTR_CONNECTED_TODAY,
+        ATTR_SESSION_COUNT,
+    }
+)
+# Presence of devices that were away for longer is forgotten, so randomized
+# MACs do not accumulate; pruned at most once per interval
+HISTORY_RETENTION = 7 * 24 * 3600
+HISTORY_PRUNE_INTERVAL = 3600
+
+STORAGE_VERSION = 1
+STORAGE_KEY_SESSION = f"{DOMAIN}.session"
+STORAGE_KEY_SNAPSHOT = f"{DOMAIN}.snapshot"
+# Coalesces snapshot writes while devices come and go
+SNAPSHOT_SAVE_DELAY = 60
 
 ENTRY_DATA_HOST = "host"
 OPTION_USERNAME = "username"
 OPTION_PASSWORD = "password"
 OPTION_SCAN_INTERVAL = "scan_interval"
-OPTION_MAC_FILTER = (
-    "mac_filter"  # Comma-separated MAC addresses to include (empty = all devices)
-)
+OPTION_MAC_FILTER = "mac_filter"  # Comma-separated MAC patterns, see MacFilter
+OPTION_ADAPTIVE_POLLING = "adaptive_polling"
+OPTION_MIN_SCAN_INTERVAL = "min_scan_interval"
+OPTION_MAX_SCAN_INTERVAL = "max_scan_interval"
+OPTION_DEVICE_SOURCES = "device_sources"
+OPTION_EXTRA_DEVICE_SOURCES = "extra_device_sources"
+OPTION_CONSIDER_HOME = "consider_home"
 OPTION_ENABLE_BINARY_SENSOR = "enable_binary_sensor"
 OPTION_ENABLE_DEVICE_TRACKER = "enable_device_tracker"
 
+# Device lists the router reports, see sources.BUILTIN_DEVICE_SOURCES
+DEVICE_SOURCE_LAN = "lan"
+DEVICE_SOURCE_PRIMARY_WLAN = "primary_wlan"
+DEVICE_SOURCE_GUEST_WLAN = "guest_wlan"
+DEFAULT_DEVICE_SOURCES = [DEVICE_SOURCE_LAN, DEVICE_SOURCE_PRIMARY_WLAN]
+
 ROUTER_PROPERTY_LAN_DEVICES = "lanDevices"
 ROUTER_PROPERTY_WLAN_DEVICES = "wlanDevices"
 
@@ -1,26 +1,84 @@
+from collections.abc import Callable
 import logging
-import json
-from datetime import timedelta
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.util import dt as dt_util
 
-from custom_components.vodafone_router_device_polling.const import DEFAULT_SCAN_INTERVAL
-from .vodafone_box import VodafoneBox
+from .const import (
+    DOMAIN,
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_JITTER,
+    ATTR_CONNECTED_SINCE,
+    ATTR_CONNECTED_TODAY,
+    ATTR_DEVICES,
+    ATTR_ENTRY_ID,
+    ATTR_HOST,
+    ATTR_LAST_LEFT,
+    ATTR_LAST_SEEN,
+    ATTR_SESSION_COUNT,
+    DEFAULT_CONSIDER_HOME,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    EVENT_DEVICE_JOINED,
+    EVENT_DEVICE_LEFT,
+    HISTORY_PRUNE_INTERVAL,
+    HISTORY_RETENTION,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_KEY_SESSION,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_VERSION,
+)
+from .exceptions import AuthenticationError, VodafoneBoxError
+from .broker import VodafoneSessionBroker, async_get_session_broker
+from .history import PresenceHistory
+from .mac_filter import parse_mac_filter
+from .models import Device, DeviceSnapshot, SnapshotDelta
+from .profiler import UpdateCycleProfiler
+from .session import VodafoneSessionManager
+from .sources import DEFAULT_SOURCES, DeviceSource
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class VodafoneDeviceCoordinator(DataUpdateCoordinator):
+def _isoformat(timestamp: float | None) -> str | None:
+    if timestamp is None:
+        return None
+    return dt_util.utc_from_timestamp(round(timestamp)).isoformat()
+
+
+@callback
+def _async_noop() -> None:
+    """Listener that only keeps the coordinator polling."""
+
+
+class VodafoneDeviceCoordinator(DataUpdateCoordinator[DeviceSnapshot]):
     """Coordinator to poll Vodafone Station devices."""
 
     def __init__(
         self,
         hass: HomeAssistant,
+        config_entry: ConfigEntry,
         host: str,
         username: str,
         password: str,
         scan_interval: int = DEFAULT_SCAN_INTERVAL,
         mac_filter: str = "",
+        device_sources: tuple[DeviceSource, ...] = DEFAULT_SOURCES,
+        consider_home: int = DEFAULT_CONSIDER_HOME,
+        adaptive_polling: bool = False,
+        min_scan_interval: int = DEFAULT_MIN_SCAN_INTERVAL,
+        max_scan_interval: int = DEFAULT_MAX_SCAN_INTERVAL,
+        broker: VodafoneSessionBroker | None = None,
     ):
         """Initialize."""
         _LOGGER.info(
@@ -28,27 +86,78 @@ class VodafoneDeviceCoordinator(DataUpdateCoordinator):
             host,
             scan_interval,
         )
-        self.box = VodafoneBox(host)
-        self.username = username
-        self.password = password
+        self.broker = broker or async_get_session_broker(hass)
+        self.hub = self.broker.hub
+        # A session validated by the config or options flow is inherited
+        self.lease = self.broker.acquire(host, username, password)
+        self.box = self.lease.box
+        self.session = VodafoneSessionManager(
+            self.box,
+            username,
+            password,
+            Store(
+                hass,
+                STORAGE_VERSION,
+                f"{STORAGE_KEY_SESSION}.{config_entry.entry_id}",
+                private=True,
+            ),
+        )
+        self._snapshot_store: Store[dict[str, list]] = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{STORAGE_KEY_SNAPSHOT}.{config_entry.entry_id}",
+        )
         self._update_count = 0  # Track update cycles
+        self.delta = SnapshotDelta()
+        self._device_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._known_macs: set[str] = set()
+        self.profiler: UpdateCycleProfiler | None = None
+        self._new_devices: list[Device] = []
+        self._new_devices_listeners: list[Callable[[list[Device]], None]] = []
+        # Joined, left and changed devices of the update, published once
+        self._pending_delta: tuple[list[Device], list[Device], list[Device]] | None = (
+            None
+        )
+        # Delta listeners and the callbacks ending them when the entry unloads
+        self._delta_listeners: dict[
+            Callable[[dict[str, Any]], None], CALLBACK_TYPE | None
+        ] = {}
 
-        # Process MAC filter
-        if mac_filter.strip():
-            self.mac_filter = {
-                mac.strip().lower().replace("-", ":")
-                for mac in mac_filter.split(",")
-                if mac.strip()
-            }
-            _LOGGER.info(
-                "MAC filter enabled for %s devices: %s",
-                len(self.mac_filter),
-                list(self.mac_filter),
-            )
+        self.mac_filter = parse_mac_filter(mac_filter)
+        if self.mac_filter:
+            _LOGGER.info("MAC filter enabled: %s", self.mac_filter.describe())
         else:
-            self.mac_filter = None
             _LOGGER.info("No MAC filter - all devices will be included")
 
+        self.device_sources = device_sources
+
+        # Monotonic time each missing device was last reported, only kept
+        # while its departure grace period runs
+        self.consider_home = consider_home
+        self._departed_at: dict[str, float] = {}
+        self._left_at: dict[str, float] = {}
+        self.history: dict[str, PresenceHistory] = {}
+        self._history_pruned_at = time.time()
+        # Time of the snapshot in self.data, connected devices were seen then
+        self._snapshot_time = time.time()
+        # Set while the devices restored at startup were not confirmed by a poll
+        self.restored_snapshot = False
+        self._devices_available = True
+
+        self.adaptive_polling = adaptive_polling
+        self.min_scan_interval = min_scan_interval
+        self.max_scan_interval = max_scan_interval
+        if adaptive_polling:
+            scan_interval = min(
+                max(scan_interval, min_scan_interval), max_scan_interval
+            )
+            _LOGGER.info(
+                "Adaptive polling enabled between %s and %s seconds",
+                min_scan_interval,
+                max_scan_interval,
+            )
+        self._adaptive_interval = float(scan_interval)
+
         _LOGGER.debug(
             "Setting up coordinator with update interval: %s seconds", scan_interval
         )
@@ -56,128 +165,473 @@ class VodafoneDeviceCoordinator(DataUpdateCoordinator):
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name="Vodafone Devices",
             update_interval=timedelta(seconds=scan_interval),
+            always_update=False,
         )
 
     async def async_login(self):
         """Login to Vodafone Station."""
+        await self.session.async_login()
+
+    async def async_load_snapshot(self) -> bool:
+        """Use the last persisted snapshot as data until the first poll.
+
+        Returns False if there is no persisted snapshot to start from.
+        """
+        if not (stored := await self._snapshot_store.async_load()):
+            return False
+
+        snapshot = DeviceSnapshot.from_storage(stored, self.mac_filter)
+        # Entities for these devices are created by the platforms
+        self._known_macs.update(snapshot.connected)
+        self.data = snapshot
+        self.restored_snapshot = True
+        # Devices still connected after the restart never show up as joined,
+        # their sessions are counted from the restart
+        now = self._snapshot_time = time.time()
+        day_start = dt_util.start_of_local_day().timestamp()
+        for mac in snapshot.connected:
+            history = self.history[mac] = PresenceHistory()
+            history.record(now, True, day_start)
         _LOGGER.info(
-            "Attempting to login to Vodafone Station for user: %s", self.username
+            "Starting from persisted snapshot with %s devices",
+            len(snapshot.connected),
         )
+        return True
+
+    async def async_start(self) -> None:
+        """Connect to the router after a start from a persisted snapshot."""
+        if await self.async_restore_session():
+            return
+        # The session manager logs in when the router rejects the request
+        await self.async_refresh()
+
+    async def async_restore_session(self) -> bool:
+        """Resume the router session persisted before the last restart.
+
+        The persisted session is validated by fetching the device overview,
+        which also provides the initial data. Returns False if there is no
+        usable session and a full login is required. A session borrowed
+        from the broker is validated the same way.
+        """
+        borrowed = self.box.is_logged_in
+        if not borrowed and not await self.session.async_restore():
+            return False
+
         try:
-            await self.hass.async_add_executor_job(
-                self.box.login, self.username, self.password
+            devices = await self.box.async_get_connected_devices(
+                self.device_sources, self.mac_filter
             )
-            _LOGGER.info("Successfully logged in to Vodafone Station")
-        except Exception as e:
-            _LOGGER.error("Failed to login to Vodafone Station: %s", e)
-            raise
-
-    async def async_logout(self):
-        """Logout from Vodafone Station."""
-        _LOGGER.info("Attempting to logout from Vodafone Station")
-        try:
-            await self.hass.async_add_executor_job(self.box.logout)
-            _LOGGER.info("Successfully logged out from Vodafone Station")
-        except Exception as e:
-            _LOGGER.error("Failed to logout from Vodafone Station: %s", e)
-            raise
+        except Exception as err:
+            _LOGGER.info("Persisted router session was rejected: %s", err)
+            return False
+
+        if borrowed:
+            _LOGGER.info("Using router session of the session broker")
+            await self.session.async_save()
+        else:
+            _LOGGER.info("Resumed persisted router session")
+        self.async_set_updated_data(self._build_snapshot(devices))
+        return True
+
+    @callback
+    def async_release_session(self) -> None:
+        """Hand the router session back, it is logged out once unused.
+
+        The persisted session is removed when the logout happens.
+        """
+        self.lease.release(self.session.async_clear)
+
+    @callback
+    def async_add_device_listener(
+        self, mac: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for updates that affect the device with the given MAC."""
+        listeners = self._device_listeners.setdefault(mac, [])
+        listeners.append(update_callback)
+        # The refresh timer only runs while generic listeners are registered
+        remove_refresh_listener = self.async_add_listener(_async_noop)
+
+        @callback
+        def remove_listener() -> None:
+            remove_refresh_listener()
+            listeners.remove(update_callback)
+            if not listeners:
+                self._device_listeners.pop(mac, None)
+
+        return remove_listener
+
+    @callback
+    def async_add_new_devices_listener(
+        self, new_devices_callback: Callable[[list[Device]], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for devices that are seen for the first time."""
+        self._new_devices_listeners.append(new_devices_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._new_devices_listeners.remove(new_devices_callback)
+
+        return remove_listener
+
+    @callback
+    def async_add_delta_listener(
+        self,
+        delta_callback: Callable[[dict[str, Any]], None],
+        end_callback: CALLBACK_TYPE | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for the joined, left and changed devices of each update.
+
+        end_callback is called if the listener is dropped because the config
+        entry unloads.
+        """
+        self._delta_listeners[delta_callback] = end_callback
+
+        @callback
+        def remove_listener() -> None:
+            self._delta_listeners.pop(delta_callback, None)
+
+        return remove_listener
+
+    @callback
+    def async_end_delta_listeners(self) -> None:
+        """Drop every delta listener, the coordinator is going away."""
+        listeners, self._delta_listeners = self._delta_listeners, {}
+        for end_callback in listeners.values():
+            if end_callback is not None:
+                end_callback()
+
+    @callback
+    def async_snapshot_message(self) -> dict[str, Any]:
+        """Return the connected devices as sent to delta subscribers."""
+        devices = self.data.devices.values() if self.data is not None else ()
+        return {ATTR_DEVICES: [device._asdict() for device in devices]}
+
+    @property
+    def devices_available(self) -> bool:
+        """Return False while restored devices could not be confirmed.
+
+        After a start from the persisted snapshot, the devices are shown
+        until the first poll fails, then unavailable until one succeeds.
+        """
+        return self.last_update_success or not self.restored_snapshot
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify generic listeners and the listeners of changed devices."""
+        super().async_update_listeners()
+
+        if self._new_devices:
+            new_devices, self._new_devices = self._new_devices, []
+            _LOGGER.info("Discovered %s new devices", len(new_devices))
+            for new_devices_callback in tuple(self._new_devices_listeners):
+                new_devices_callback(new_devices)
+
+        affected = self.delta.affected
+        if (available := self.devices_available) != self._devices_available:
+            # Availability is part of every device entity's state
+            self._devices_available = available
+            affected = affected | set(self._device_listeners)
+        if self.last_update_success:
+            self.restored_snapshot = False
+        _LOGGER.debug(
+            "Notifying listeners of %s changed devices (joined: %s, left: %s)",
+            len(affected),
+            len(self.delta.joined),
+            len(self.delta.left),
+        )
+        for mac in affected:
+            for update_callback in tuple(self._device_listeners.get(mac, ())):
+                update_callback()
+
+        if self._pending_delta is not None:
+            pending_delta, self._pending_delta = self._pending_delta, None
+            self._async_publish_delta(*pending_delta)
 
-    async def _async_update_data(self):
+    @callback
+    def _async_publish_delta(
+        self, joined: list[Device], left: list[Device], changed: list[Device]
+    ) -> None:
+        """Fire one bus event per direction and notify delta subscribers.
+
+        A single event carries every device of the update, so consumers do
+        not have to filter the state changes of each device entity.
+        """
+        event_data = {
+            ATTR_ENTRY_ID: self.config_entry.entry_id,
+            ATTR_HOST: self.box.host,
+        }
+        if joined:
+            self.hass.bus.async_fire(
+                EVENT_DEVICE_JOINED,
+                {**event_data, ATTR_DEVICES: [device._asdict() for device in joined]},
+            )
+        if left:
+            self.hass.bus.async_fire(
+                EVENT_DEVICE_LEFT,
+                {**event_data, ATTR_DEVICES: [device._asdict() for device in left]},
+            )
+
+        if not self._delta_listeners:
+            return
+        message = {
+            "joined": [device._asdict() for device in joined],
+            "left": [device.mac for device in left],
+            "changed": [device._asdict() for device in changed],
+        }
+        for delta_callback in tuple(self._delta_listeners):
+            delta_callback(message)
+
+    @callback
+    def async_start_profiling(self, cycles: int) -> None:
+        """Profile the next update cycles, see UpdateCycleProfiler."""
+        if self.profiler is not None:
+            raise HomeAssistantError("Profiling is already in progress")
+        _LOGGER.info("Profiling the next %s update cycles", cycles)
+        self.profiler = UpdateCycleProfiler(cycles)
+
+    async def _async_refresh(self, *args, **kwargs) -> None:
+        """Refresh, profiling the whole cycle including listeners if requested."""
+        if (profiler := self.profiler) is None:
+            await super()._async_refresh(*args, **kwargs)
+            return
+
+        await profiler.async_profile_cycle(
+            super()._async_refresh(*args, **kwargs), self.box.stats
+        )
+        if profiler.done:
+            self.profiler = None
+            profile_path, summary_path = await self.hass.async_add_executor_job(
+                profiler.write,
+                self.hass.config.path(),
+                f"{DOMAIN}_profile_{self.config_entry.entry_id}",
+            )
+            _LOGGER.warning(
+                "Update cycle profile written to %s, timing summary to %s",
+                profile_path,
+                summary_path,
+            )
+
+    async def _async_update_data(self) -> DeviceSnapshot:
         """Fetch connected devices."""
         _LOGGER.debug("Starting device data update (cycle %s)", self._update_count)
         self._update_count += 1
+        # Only a successful update may notify device listeners
+        self.delta = SnapshotDelta()
 
-        # Force fresh login every N cycles (e.g., every 10 minutes)
-        force_fresh_login = (
-            self._update_count % 20 == 0
-        )  # Every 20 cycles = 10 mins if 30s interval
-
-        if force_fresh_login:
-            _LOGGER.debug(
-                "Performing periodic session refresh (cycle %s)", self._update_count
-            )
-            try:
-                await self.async_logout()
-                await self.async_login()
-            except Exception as refresh_err:
-                _LOGGER.warning(
-                    "Periodic session refresh failed, continuing with existing session: %s",
-                    refresh_err,
-                )
+        if self.hub:
+            await self.hub.async_wait_for_poll_slot()
+        self.box.stats.record_poll(time.monotonic())
 
         try:
-            devices = await self.hass.async_add_executor_job(
-                self.box.get_connected_devices
+            devices = await self.session.async_get_connected_devices(
+                self.device_sources, self.mac_filter
             )
-
-            if devices:
-                # Normalize all MAC addresses to lowercase for consistency
-                for device in devices.get("lanDevices", []):
-                    if device.get("MAC"):
-                        device["MAC"] = device["MAC"].lower()
-
-                for device in devices.get("wlanDevices", []):
-                    if device.get("MAC"):
-                        device["MAC"] = device["MAC"].lower()
-
-                # Apply MAC filtering if configured
-                if self.mac_filter:
-                    original_lan_count = len(devices.get("lanDevices", []))
-                    original_wlan_count = len(devices.get("wlanDevices", []))
-
-                    filtered_lan = [
-                        d
-                        for d in devices.get("lanDevices", [])
-                        if d.get("MAC", "") in self.mac_filter
-                    ]
-                    filtered_wlan = [
-                        d
-                        for d in devices.get("wlanDevices", [])
-                        if d.get("MAC", "") in self.mac_filter
-                    ]
-
-                    devices["lanDevices"] = filtered_lan
-                    devices["wlanDevices"] = filtered_wlan
-
-                    _LOGGER.debug(
-                        "MAC filtering applied: LAN %s->%s, WLAN %s->%s",
-                        original_lan_count,
-                        len(filtered_lan),
-                        original_wlan_count,
-                        len(filtered_wlan),
-                    )
-
-                lan_count = len(devices.get("lanDevices", []))
-                wlan_count = len(devices.get("wlanDevices", []))
-                _LOGGER.info(
-                    "Device update successful: %s LAN devices, %s WLAN devices",
-                    lan_count,
-                    wlan_count,
-                )
-                _LOGGER.debug("Updated device data: %s", devices)
-            else:
-                _LOGGER.warning("No device data returned from router")
-
-            return devices
-        except (ValueError, json.JSONDecodeError) as err:
-            # Likely session expired - try to re-login once
-            _LOGGER.warning("Device fetch failed, attempting re-login: %s", err)
-            try:
-                await self.async_login()
-                devices = await self.hass.async_add_executor_job(
-                    self.box.get_connected_devices
-                )
-                _LOGGER.info("Re-login successful, device data retrieved")
-                return devices
-            except Exception as retry_err:
-                _LOGGER.error("Re-login failed: %s", retry_err, exc_info=True)
-                raise UpdateFailed(
-                    f"Error fetching devices after re-login: {retry_err}"
-                ) from retry_err
+            if (
+                self.box.overview_unchanged
+                and self.data is not None
+                and not self._departed_at
+            ):
+                # Returning the same snapshot skips every listener
+                _LOGGER.debug("Overview data unchanged, keeping previous snapshot")
+                if self.adaptive_polling:
+                    self._adapt_update_interval()
+                return self.data
+            return self._build_snapshot(devices)
+        except AuthenticationError as err:
+            # Also after a warm start, whose login only happens in the polls
+            self.box.stats.record_failure(err)
+            _LOGGER.error("Vodafone Station refused the credentials: %s", err)
+            raise ConfigEntryAuthFailed(
+                f"Vodafone Station refused the credentials: {err}"
+            ) from err
+        except VodafoneBoxError as err:
+            # Classified failures were already retried where that helps
+            self.box.stats.record_failure(err)
+            _LOGGER.warning(
+                "Error fetching devices from Vodafone Station (%s): %s",
+                type(err).__name__,
+                err,
+            )
+            raise UpdateFailed(f"Error fetching devices: {err}") from err
         except Exception as err:
+            self.box.stats.record_failure(err)
             _LOGGER.error(
                 "Error fetching devices from Vodafone Station: %s", err, exc_info=True
             )
             raise UpdateFailed(f"Error fetching devices: {err}") from err
+
+    def _build_snapshot(self, devices) -> DeviceSnapshot:
+        """Index the filtered router data into a snapshot."""
+        if devices:
+            lan_count = len(devices.get("lanDevices", []))
+            wlan_count = len(devices.get("wlanDevices", []))
+            _LOGGER.info(
+                "Device update successful: %s LAN devices, %s WLAN devices",
+                lan_count,
+                wlan_count,
+            )
+            _LOGGER.debug("Updated device data: %s", devices)
+        else:
+            _LOGGER.warning("No device data returned from router")
+
+        snapshot = self._hold_departing(DeviceSnapshot.from_router_data(devices))
+        self.delta = SnapshotDelta.between(self.data, snapshot)
+        self._record_history()
+        if self.adaptive_polling and self.data is not None:
+            self._adapt_update_interval()
+
+        # Devices present in the first snapshot are created by the platforms
+        # Devices whose entities still exist were pruned from the known MACs
+        if self.data is not None:
+            self._new_devices = [
+                snapshot.devices[mac]
+                for mac in snapshot.connected - self._known_macs
+                if mac not in self._device_listeners
+            ]
+        self._known_macs.update(snapshot.connected)
+        # The first snapshot is the starting point, not a presence change
+        if self.data is not None and self.delta:
+            self._pending_delta = (
+                [snapshot.devices[mac] for mac in self.delta.joined],
+                [self.data.devices[mac] for mac in self.delta.left],
+                [snapshot.devices[mac] for mac in self.delta.changed],
+            )
+        if self.data is None or self.delta:
+            self._snapshot_store.async_delay_save(
+                snapshot.as_storage, SNAPSHOT_SAVE_DELAY
+            )
+        return snapshot
+
+    def _record_history(self) -> None:
+        """Add the joins and leaves of the current delta to the history."""
+        now = self._snapshot_time = time.time()
+        day_start = dt_util.start_of_local_day().timestamp()
+        for mac in self.delta.joined:
+            if (history := self.history.get(mac)) is None:
+                history = self.history[mac] = PresenceHistory()
+            history.record(now, True, day_start)
+        for mac in self.delta.left:
+            left_at = self._left_at.pop(mac, now)
+            if (history := self.history.get(mac)) is not None:
+                history.record(left_at, False, day_start)
+        if now - self._history_pruned_at >= HISTORY_PRUNE_INTERVAL:
+            self._prune_history(now)
+
+    def _prune_history(self, now: float) -> None:
+        """Forget devices that have been away for longer than the retention."""
+        self._history_pruned_at = now
+        connected = self.data.connected if self.data is not None else frozenset()
+        expired = {
+            mac
+            for mac, history in self.history.items()
+            if history.connected_since is None
+            and (history.last_left or 0) < now - HISTORY_RETENTION
+        }
+        for mac in expired:
+            del self.history[mac]
+        stale = {
+            mac
+            for mac in self._known_macs
+            if mac not in connected and mac not in self.history
+        }
+        self._known_macs -= stale
+        if expired or stale:
+            _LOGGER.debug(
+                "Pruned presence history of %s and %s known devices",
+                len(expired),
+                len(stale),
+            )
+
+    @callback
+    def async_presence_attributes(self, mac: str) -> dict[str, Any]:
+        """Return presence statistics of a device for its state attributes.
+
+        The values are taken when the entities write their state, which is
+        when the device joins or leaves and when a new day starts.
+        """
+        if (history := self.history.get(mac)) is None:
+            return {}
+        connected = history.connected_since is not None
+        return {
+            ATTR_CONNECTED_SINCE: _isoformat(history.connected_since),
+            ATTR_LAST_LEFT: _isoformat(history.last_left),
+            ATTR_LAST_SEEN: _isoformat(
+                self._snapshot_time if connected else history.last_left
+            ),
+            ATTR_CONNECTED_TODAY: round(
+                history.connected_today(
+                    time.time(), dt_util.start_of_local_day().timestamp()
+                )
+            ),
+            ATTR_SESSION_COUNT: history.session_count,
+        }
+
+    @callback
+    def async_track_new_day(self) -> CALLBACK_TYPE:
+        """Write the presence attributes again at local midnight.
+
+        connected_today restarts every day, also for devices that do not
+        join or leave.
+        """
+        return async_track_time_change(
+            self.hass, self._async_new_day, hour=0, minute=0, second=0
+        )
+
+    @callback
+    def _async_new_day(self, now: datetime) -> None:
+        for mac in tuple(self.history):
+            for update_callback in tuple(self._device_listeners.get(mac, ())):
+                update_callback()
+
+    def _hold_departing(self, snapshot: DeviceSnapshot) -> DeviceSnapshot:
+        """Keep missing devices connected until consider_home has passed.
+
+        Power-saving WLAN clients drop out of the router lists for single
+        polls, which would otherwise flip their entities twice.
+        """
+        if not self.consider_home or self.data is None:
+            return snapshot
+
+        now = time.monotonic()
+        departed_at = self._departed_at
+        for mac in departed_at.keys() & snapshot.connected:
+            _LOGGER.debug("Device %s is back before being reported away", mac)
+            del departed_at[mac]
+        for mac in self.data.connected - snapshot.connected:
+            departed_at.setdefault(mac, now)
+
+        held = []
+        for mac, since in tuple(departed_at.items()):
+            if now - since < self.consider_home:
+                held.append(mac)
+            else:
+                _LOGGER.debug("Device %s missing for %.0f seconds", mac, now - since)
+                del departed_at[mac]
+                # The history records when the device actually left
+                self._left_at[mac] = time.time() - (now - since)
+
+        if not held:
+            return snapshot
+        _LOGGER.debug("Holding %s missing devices as connected", len(held))
+        return snapshot.holding(self.data, held)
+
+    def _adapt_update_interval(self) -> None:
+        """Poll faster after presence changes and slower while nothing changes."""
+        if self.delta.joined or self.delta.left:
+            self._adaptive_interval = self.min_scan_interval
+        else:
+            self._adaptive_interval = min(
+                self._adaptive_interval * ADAPTIVE_BACKOFF_FACTOR,
+                self.max_scan_interval,
+            )
+
+        # Jitter keeps several coordinators from settling on the same tick
+        seconds = self._adaptive_interval * random.uniform(
+            1 - ADAPTIVE_JITTER, 1 + ADAPTIVE_JITTER
+        )
+        seconds = min(max(seconds, self.min_scan_interval), self.max_scan_interval)
+        _LOGGER.debug("Adaptive polling: next update in %.1f seconds", seconds)
+        self.update_interval = timedelta(seconds=seconds)
@@ -6,18 +6,12 @@ from typing import Any
 from homeassistant.components.device_tracker import TrackerEntity, SourceType
 from homeassistant.const import STATE_HOME, STATE_NOT_HOME
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import (
-    DEVICE_PROPERTY_HOSTNAME,
-    DEVICE_PROPERTY_MAC_ADDRESS,
-    DEVICE_PROPERTY_NAME,
-    DOMAIN,
-    ROUTER_PROPERTY_LAN_DEVICES,
-    ROUTER_PROPERTY_WLAN_DEVICES,
-)
+from .const import DOMAIN, PRESENCE_ATTRIBUTES
 from .coordinator import VodafoneDeviceCoordinator
+from .models import Device
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -39,49 +33,52 @@ async def async_setup_entry(
 
     _LOGGER.debug("Creating device tracker entities from connected devices")
     entities: list[VodafoneDeviceTracker] = []
-    total_devices = 0
-
-    for dev_list_name in (ROUTER_PROPERTY_LAN_DEVICES, ROUTER_PROPERTY_WLAN_DEVICES):
-        devices = coordinator.data.get(dev_list_name, [])
-        _LOGGER.debug("Processing %s devices from %s", len(devices), dev_list_name)
-
-        for device in devices:
-            total_devices += 1
-            if not device.get(DEVICE_PROPERTY_MAC_ADDRESS):
-                _LOGGER.warning("Skipping device without MAC address: %s", device)
-                continue
-
-            _LOGGER.debug(
-                "Creating tracker entity for device: %s (%s)",
-                device.get(DEVICE_PROPERTY_HOSTNAME, "Unknown"),
-                device.get(DEVICE_PROPERTY_MAC_ADDRESS),
-            )
-            entities.append(VodafoneDeviceTracker(coordinator, device))
+
+    for device in coordinator.data.devices.values():
+        _LOGGER.debug(
+            "Creating tracker entity for device: %s (%s)",
+            device.hostname or "Unknown",
+            device.mac,
+        )
+        entities.append(VodafoneDeviceTracker(coordinator, device))
 
     _LOGGER.info(
         "Created %s device tracker entities from %s total devices",
         len(entities),
-        total_devices,
+        len(coordinator.data.devices),
     )
     async_add_entities(entities)
 
+    @callback
+    def async_add_new_devices(devices: list[Device]) -> None:
+        """Add entities for devices that connected after setup."""
+        _LOGGER.debug("Adding %s entities for new devices", len(devices))
+        async_add_entities(
+            [VodafoneDeviceTracker(coordinator, device) for device in devices]
+        )
+
+    entry.async_on_unload(
+        coordinator.async_add_new_devices_listener(async_add_new_devices)
+    )
+
 
 class VodafoneDeviceTracker(TrackerEntity):
     """Device tracker for a Vodafone Station connected device."""
 
     _attr_source_type = SourceType.ROUTER
+    # State is written by the coordinator for changed devices only
+    _attr_should_poll = False
+    _unrecorded_attributes = PRESENCE_ATTRIBUTES
 
     def __init__(
         self,
         coordinator: VodafoneDeviceCoordinator,
-        device: dict[str, Any],
+        device: Device,
     ) -> None:
         self.coordinator = coordinator
-        self.device = device
-        self.mac: str = device.get(DEVICE_PROPERTY_MAC_ADDRESS)
-        # MAC is guaranteed here because we filtered earlier
-        self._attr_name = f"{device.get(DEVICE_PROPERTY_HOSTNAME) or device.get(DEVICE_PROPERTY_NAME) or self.mac} Tracker"
-        self._attr_unique_id = f"vodafone_{self.mac.replace(':', '').lower()}_tracker"
+        self.mac: str = device.mac
+        self._attr_name = f"{device.name} Tracker"
+        self._attr_unique_id = f"vodafone_{self.mac.replace(':', '')}_tracker"
 
         _LOGGER.debug(
             "Initialized device tracker for %s (MAC: %s, unique_id: %s)",
@@ -96,17 +93,7 @@ class VodafoneDeviceTracker(TrackerEntity):
         if self.coordinator.data is None:
             return STATE_NOT_HOME
 
-        connected_macs = {
-            d.get(DEVICE_PROPERTY_MAC_ADDRESS)
-            for d in self.coordinator.data.get(ROUTER_PROPERTY_LAN_DEVICES, [])
-        }
-        connected_macs.update(
-            {
-                d.get(DEVICE_PROPERTY_MAC_ADDRESS)
-                for d in self.coordinator.data.get(ROUTER_PROPERTY_WLAN_DEVICES, [])
-            }
-        )
-        is_connected = self.mac in connected_macs
+        is_connected = self.coordinator.data.is_connected(self.mac)
 
         state = STATE_HOME if is_connected else STATE_NOT_HOME
         _LOGGER.debug(
@@ -117,10 +104,19 @@ class VodafoneDeviceTracker(TrackerEntity):
     @property
     def location_name(self) -> str | None:
         """Return the location name of the device."""
-        return STATE_HOME if self.state == STATE_HOME else None
+        if self.coordinator.data is None:
+            return None
+        return STATE_HOME if self.coordinator.data.is_connected(self.mac) else None
 
-    async def async_update(self) -> None:
-        await self.coordinator.async_request_refresh()
+    @property
+    def available(self) -> bool:
+        """Return False while restored devices could not be confirmed."""
+        return self.coordinator.devices_available
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return presence statistics kept by the coordinator."""
+        return self.coordinator.async_presence_attributes(self.mac)
 
     async def async_added_to_hass(self) -> None:
         """Register for coordinator updates."""
@@ -128,7 +124,9 @@ class VodafoneDeviceTracker(TrackerEntity):
             "Adding device tracker %s (%s) to Home Assistant", self._attr_name, self.mac
         )
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_device_listener(
+                self.mac, self.async_write_ha_state
+            )
         )
         _LOGGER.debug(
             "Registered device tracker %s for coordinator updates", self._attr_name
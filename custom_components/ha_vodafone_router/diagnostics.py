@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, OPTION_MAC_FILTER, OPTION_PASSWORD, OPTION_USERNAME
+from .coordinator import VodafoneDeviceCoordinator
+
+TO_REDACT = {OPTION_MAC_FILTER, OPTION_PASSWORD, OPTION_USERNAME, "mac"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: VodafoneDeviceCoordinator = hass.data[DOMAIN][entry.entry_id]
+    box = coordinator.box
+
+    return {
+        "options": async_redact_data(entry.options, TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "connected_devices": len(coordinator.data.connected)
+            if coordinator.data
+            else 0,
+        },
+        "session": {
+            "logins": coordinator.session.login_count,
+            "relogins": coordinator.session.relogin_count,
+            "retries": coordinator.session.retry_count,
+        },
+        "overview_cache": {
+            "hits": box.overview_cache_hits,
+            "misses": box.overview_cache_misses,
+        },
+        "statistics": box.stats.as_dict(),
+        "polling_hub": coordinator.hub.as_dict(),
+        "presence_history": async_redact_data(
+            [
+                {
+                    "mac": mac,
+                    "transitions": [
+                        [
+                            dt_util.utc_from_timestamp(timestamp).isoformat(),
+                            "joined" if joined else "left",
+                        ]
+                        for timestamp, joined in history.transitions()
+                    ],
+                }
+                for mac, history in coordinator.history.items()
+            ],
+            TO_REDACT,
+        ),
+    }
@@ -0,0 +1,30 @@
+class VodafoneBoxError(Exception):
+    """Base class for errors raised while talking to the Vodafone Station."""
+
+
+class AuthenticationError(VodafoneBoxError):
+    """The router refused the username or password."""
+
+
+class SessionExpiredError(VodafoneBoxError):
+    """The router no longer accepts the current session."""
+
+
+class TransientRouterError(VodafoneBoxError):
+    """The request failed on the network and may succeed when repeated."""
+
+
+class RouterOverloadedError(TransientRouterError):
+    """The router answered with a busy or server error status."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ParseDriftError(VodafoneBoxError):
+    """The router answered, but not in the format the parser expects."""
+
+
+class EndpointNotFoundError(ParseDriftError):
+    """The router does not serve the requested page, e.g. on older firmware."""
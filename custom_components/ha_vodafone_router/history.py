@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+
+# Transitions kept per device; older ones are overwritten
+HISTORY_SIZE = 32
+
+
+class PresenceHistory:
+    """Ring buffer of join and leave transitions of one device.
+
+    Timestamps live in a fixed size array, so memory does not grow with
+    uptime. The statistics are updated per transition instead of being
+    computed from the buffer, so they only change when the device joins or
+    leaves.
+    """
+
+    __slots__ = (
+        "_times",
+        "_joins",
+        "_next",
+        "_count",
+        "connected_since",
+        "last_left",
+        "session_count",
+        "_day_start",
+        "_connected_today",
+    )
+
+    def __init__(self, size: int = HISTORY_SIZE):
+        self._times = array("d", bytes(8 * size))
+        self._joins = bytearray(size)
+        self._next = 0
+        self._count = 0
+        self.connected_since: float | None = None
+        self.last_left: float | None = None
+        self.session_count = 0
+        self._day_start = 0.0
+        self._connected_today = 0.0
+
+    def record(self, timestamp: float, joined: bool, day_start: float) -> None:
+        """Record a transition at a UNIX timestamp.
+
+        day_start is the timestamp of the last local midnight, the time
+        connected today restarts from there.
+        """
+        self._roll_day(day_start)
+        if joined:
+            if self.connected_since is not None:
+                return
+            self.connected_since = timestamp
+            self.session_count += 1
+        else:
+            if self.connected_since is None:
+                return
+            self._connected_today += max(
+                0.0, timestamp - max(self.connected_since, day_start)
+            )
+            self.connected_since = None
+            self.last_left = timestamp
+
+        size = len(self._times)
+        self._times[self._next] = timestamp
+        self._joins[self._next] = joined
+        self._next = (self._next + 1) % size
+        self._count = min(self._count + 1, size)
+
+    def _roll_day(self, day_start: float) -> None:
+        if day_start != self._day_start:
+            self._day_start = day_start
+            self._connected_today = 0.0
+
+    def connected_today(self, now: float, day_start: float) -> float:
+        """Return the seconds connected since day_start, up to now.
+
+        The running session counts from its start or from day_start,
+        whichever is later.
+        """
+        self._roll_day(day_start)
+        if self.connected_since is None:
+            return self._connected_today
+        return self._connected_today + max(
+            0.0, now - max(self.connected_since, day_start)
+        )
+
+    def transitions(self) -> Iterator[tuple[float, bool]]:
+        """Yield the buffered (timestamp, joined) transitions, oldest first."""
+        size = len(self._times)
+        start = (self._next - self._count) % size
+        for offset in range(self._count):
+            index = (start + offset) % size
+            yield self._times[index], bool(self._joins[index])
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from .const import (
+    MAX_CONCURRENT_REQUESTS,
+    MAX_CONCURRENT_REQUESTS_PER_HOST,
+    POLL_START_SPACING,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HostRequestLimiter:
+    """Async context manager holding a global and a per-host request slot."""
+
+    def __init__(self, global_slots: asyncio.Semaphore, host_slots: asyncio.Semaphore):
+        self._global_slots = global_slots
+        self._host_slots = host_slots
+
+    async def __aenter__(self) -> None:
+        await self._host_slots.acquire()
+        try:
+            await self._global_slots.acquire()
+        except BaseException:
+            self._host_slots.release()
+            raise
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._global_slots.release()
+        self._host_slots.release()
+
+
+class VodafonePollingHub:
+    """Coordinate the coordinators of all configured Vodafone Stations.
+
+    Requests are capped per host and across all hosts, and poll starts are
+    kept at least POLL_START_SPACING apart. Because the next refresh is
+    scheduled relative to the end of the previous one, a poll that had to
+    wait for its start slot keeps that offset, so coordinators that started on
+    the same tick drift apart after their first collision.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        max_concurrent_requests_per_host: int = MAX_CONCURRENT_REQUESTS_PER_HOST,
+        poll_start_spacing: float = POLL_START_SPACING,
+    ):
+        self._global_slots = asyncio.Semaphore(max_concurrent_requests)
+        self._max_concurrent_requests_per_host = max_concurrent_requests_per_host
+        self._limiters: dict[str, HostRequestLimiter] = {}
+        self._poll_start_spacing = poll_start_spacing
+        self._next_poll_start = 0.0
+        self._last_poll_start: float | None = None
+        # Shortest gap seen between two poll starts and how often one waited
+        self.min_poll_start_gap: float | None = None
+        self.staggered_polls = 0
+
+    def limiter(self, host: str) -> HostRequestLimiter:
+        """Return the request limiter shared by everything talking to host."""
+        if (limiter := self._limiters.get(host)) is None:
+            limiter = self._limiters[host] = HostRequestLimiter(
+                self._global_slots,
+                asyncio.Semaphore(self._max_concurrent_requests_per_host),
+            )
+        return limiter
+
+    async def async_wait_for_poll_slot(self) -> None:
+        """Delay the caller until its poll no longer collides with another."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next_poll_start)
+        self._next_poll_start = start + self._poll_start_spacing
+        if self._last_poll_start is not None:
+            gap = start - self._last_poll_start
+            if self.min_poll_start_gap is None or gap < self.min_poll_start_gap:
+                self.min_poll_start_gap = gap
+        self._last_poll_start = start
+        if (delay := start - now) > 0:
+            self.staggered_polls += 1
+            _LOGGER.debug("Staggering poll start by %.1f seconds", delay)
+            await asyncio.sleep(delay)
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        return {
+            "staggered_polls": self.staggered_polls,
+            "min_poll_start_gap_s": round(self.min_poll_start_gap, 1)
+            if self.min_poll_start_gap is not None
+            else None,
+        }
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+import re
+
+_LOGGER = logging.getLogger(__name__)
+
+EXCLUDE_PREFIX = "!"
+WILDCARD = "*"
+
+_OCTET = re.compile(r"[0-9a-f]{2}")
+_MAC_OCTETS = 6
+# Marks a trie node where a pattern ends
+_END = ""
+
+
+def _parse_pattern(pattern: str) -> tuple[str, ...] | None:
+    """Split a MAC pattern into octets, None if it is invalid.
+
+    Fewer than six octets or a trailing "*" match a prefix such as an OUI,
+    a "*" octet elsewhere matches any octet.
+    """
+    octets = pattern.lower().replace("-", ":").split(":")
+    if octets[-1] == WILDCARD:
+        octets.pop()
+    if not 0 < len(octets) <= _MAC_OCTETS:
+        return None
+    if not all(octet == WILDCARD or _OCTET.fullmatch(octet) for octet in octets):
+        return None
+    return tuple(octets)
+
+
+class _PatternSet:
+    """Exact MACs in a set, prefixes and wildcards in an octet trie."""
+
+    __slots__ = ("exact", "trie")
+
+    def __init__(self):
+        self.exact: set[str] = set()
+        self.trie: dict = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.exact or self.trie)
+
+    def add(self, octets: tuple[str, ...]) -> None:
+        if len(octets) == _MAC_OCTETS and WILDCARD not in octets:
+            self.exact.add(":".join(octets))
+            return
+        node = self.trie
+        for octet in octets:
+            node = node.setdefault(octet, {})
+        node[_END] = True
+
+    def matches(self, mac: str) -> bool:
+        if mac in self.exact:
+            return True
+        if not self.trie:
+            return False
+
+        nodes = [self.trie]
+        for octet in mac.split(":"):
+            next_nodes = []
+            for node in nodes:
+                if _END in node:
+                    return True
+                if (child := node.get(octet)) is not None:
+                    next_nodes.append(child)
+                if (child := node.get(WILDCARD)) is not None:
+                    next_nodes.append(child)
+            if not next_nodes:
+                return False
+            nodes = next_nodes
+        return any(_END in node for node in nodes)
+
+
+class MacFilter:
+    """Compiled MAC filter.
+
+    Entries are exact MACs (aa:bb:cc:dd:ee:ff), prefixes such as an OUI
+    (aa:bb:cc or aa:bb:cc:*) and wildcard octets (aa:*:cc:dd:ee:ff). Entries
+    starting with "!" exclude devices and win over includes. Without
+    includes, every device that is not excluded passes. A filter whose
+    entries were all invalid matches no device.
+    """
+
+    __slots__ = ("include", "exclude", "match_none")
+
+    def __init__(self):
+        self.include = _PatternSet()
+        self.exclude = _PatternSet()
+        self.match_none = False
+
+    def __bool__(self) -> bool:
+        return self.match_none or bool(self.include or self.exclude)
+
+    def matches(self, mac: str) -> bool:
+        """Return True if the lowercase MAC passes the filter."""
+        if self.match_none:
+            return False
+        if self.exclude and self.exclude.matches(mac):
+            return False
+        return not self.include or self.include.matches(mac)
+
+    def matcher(self) -> Callable[[str], bool]:
+        """Return the cheapest callable equivalent to matches.
+
+        A filter of exact MACs only, the common case, is a set lookup.
+        """
+        if self.match_none:
+            return _match_none
+        if not self.exclude and not self.include.trie:
+            return self.include.exact.__contains__
+        return self.matches
+
+    def describe(self) -> dict[str, int]:
+        """Return the number of compiled entries, for logging."""
+        return {
+            "exact": len(self.include.exact),
+            "patterns": _count_patterns(self.include.trie),
+            "exclusions": len(self.exclude.exact) + _count_patterns(self.exclude.trie),
+        }
+
+
+def _match_none(mac: str) -> bool:
+    return False
+
+
+def _count_patterns(node: dict) -> int:
+    return sum(
+        1 if key == _END else _count_patterns(child) for key, child in node.items()
+    )
+
+
+def invalid_mac_filter_entries(mac_filter: str) -> list[str]:
+    """Return the entries of the filter option that are not valid patterns."""
+    return [
+        entry
+        for entry in (entry.strip() for entry in mac_filter.split(","))
+        if entry and _parse_pattern(entry.removeprefix(EXCLUDE_PREFIX).strip()) is None
+    ]
+
+
+def parse_mac_filter(mac_filter: str) -> MacFilter | None:
+    """Compile the comma-separated MAC filter option, None means no filter.
+
+    An option with entries of which none is valid matches no device, rather
+    than tracking every device.
+    """
+    compiled = MacFilter()
+    has_entries = False
+    for entry in mac_filter.split(","):
+        if not (entry := entry.strip()):
+            continue
+        has_entries = True
+        excluded = entry.startswith(EXCLUDE_PREFIX)
+        if (
+            octets := _parse_pattern(entry.removeprefix(EXCLUDE_PREFIX).strip())
+        ) is None:
+            _LOGGER.warning("Ignoring invalid MAC filter entry: %s", entry)
+            continue
+        (compiled.exclude if excluded else compiled.include).add(octets)
+    if has_entries and not compiled:
+        _LOGGER.warning("No valid MAC filter entry, no device will be included")
+        compiled.match_none = True
+    return compiled or None
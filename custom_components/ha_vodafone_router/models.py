@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, NamedTuple
+import logging
+import sys
+
+from .const import (
+    DEVICE_PROPERTY_HOSTNAME,
+    DEVICE_PROPERTY_IP_ADDRESS,
+    DEVICE_PROPERTY_MAC_ADDRESS,
+    DEVICE_PROPERTY_NAME,
+    ROUTER_PROPERTY_LAN_DEVICES,
+    ROUTER_PROPERTY_WLAN_DEVICES,
+)
+
+if TYPE_CHECKING:
+    from .mac_filter import MacFilter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Device(NamedTuple):
+    """A device attached to the router, reduced to the fields the integration uses.
+
+    Tuple-backed records are immutable, hashable and cheaper to build and
+    store than the router's JSON objects or a frozen dataclass.
+    """
+
+    mac: str
+    hostname: str | None = None
+    ip: str | None = None
+
+    @classmethod
+    def _from_router(cls, data: Mapping[str, Any], mac: str) -> Device:
+        hostname = data.get(DEVICE_PROPERTY_HOSTNAME) or data.get(DEVICE_PROPERTY_NAME)
+        # MACs and hostnames repeat every poll, interning shares one copy
+        return cls(
+            sys.intern(mac),
+            sys.intern(hostname) if hostname else None,
+            data.get(DEVICE_PROPERTY_IP_ADDRESS),
+        )
+
+    @classmethod
+    def _from_fields(
+        cls, mac: str, hostname: str | None = None, ip: str | None = None
+    ) -> Device:
+        return cls(sys.intern(mac), sys.intern(hostname) if hostname else None, ip)
+
+    @property
+    def name(self) -> str:
+        """Return the hostname, falling back to the MAC address."""
+        return self.hostname or self.mac
+
+
+def devices_from_router(
+    entries: Iterable[Mapping[str, Any]], mac_filter: MacFilter | None = None
+) -> tuple[Device, ...]:
+    """Convert a router device list, skipping entries without a MAC.
+
+    Entries rejected by the MAC filter are skipped before a record is built.
+    """
+    matches = mac_filter.matcher() if mac_filter is not None else None
+    devices = []
+    for entry in entries:
+        if not (mac := entry.get(DEVICE_PROPERTY_MAC_ADDRESS)):
+            _LOGGER.warning("Skipping device without MAC address: %s", entry)
+            continue
+        mac = mac.lower()
+        if matches is not None and not matches(mac):
+            continue
+        devices.append(Device._from_router(entry, mac))
+    return tuple(devices)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class DeviceSnapshot:
+    """Immutable view of the devices reported by one coordinator update.
+
+    Snapshots compare by identity, so the coordinator only skips its
+    listeners when an update returns the previous snapshot unchanged.
+    The LAN and WLAN lists are as reported by the router, while devices and
+    connected also hold devices within their departure grace period.
+    """
+
+    lan_devices: tuple[Device, ...] = ()
+    wlan_devices: tuple[Device, ...] = ()
+    devices: Mapping[str, Device] = field(default_factory=lambda: MappingProxyType({}))
+    connected: frozenset[str] = frozenset()
+
+    @classmethod
+    def from_router_data(
+        cls, data: Mapping[str, tuple[Device, ...]] | None
+    ) -> DeviceSnapshot:
+        """Index the LAN and WLAN device lists by MAC."""
+        if not data:
+            return cls()
+
+        lan_devices = tuple(data.get(ROUTER_PROPERTY_LAN_DEVICES, ()))
+        wlan_devices = tuple(data.get(ROUTER_PROPERTY_WLAN_DEVICES, ()))
+
+        devices: dict[str, Device] = {}
+        for device in (*lan_devices, *wlan_devices):
+            # LAN wins if a device is reported on both interfaces
+            devices.setdefault(device.mac, device)
+
+        return cls(
+            lan_devices=lan_devices,
+            wlan_devices=wlan_devices,
+            devices=MappingProxyType(devices),
+            connected=frozenset(devices),
+        )
+
+    def as_storage(self) -> dict[str, list[list[str | None]]]:
+        """Return the device lists reported by the router for persisting."""
+        return {
+            ROUTER_PROPERTY_LAN_DEVICES: [list(device) for device in self.lan_devices],
+            ROUTER_PROPERTY_WLAN_DEVICES: [
+                list(device) for device in self.wlan_devices
+            ],
+        }
+
+    @classmethod
+    def from_storage(
+        cls,
+        data: Mapping[str, list[list[str | None]]],
+        mac_filter: MacFilter | None = None,
+    ) -> DeviceSnapshot:
+        """Rebuild a snapshot persisted with as_storage."""
+        matches = mac_filter.matcher() if mac_filter is not None else None
+        return cls.from_router_data(
+            {
+                interface: tuple(
+                    Device._from_fields(*fields)
+                    for fields in data.get(interface, ())
+                    if matches is None or matches(fields[0])
+                )
+                for interface in (
+                    ROUTER_PROPERTY_LAN_DEVICES,
+                    ROUTER_PROPERTY_WLAN_DEVICES,
+                )
+            }
+        )
+
+    def holding(self, previous: DeviceSnapshot, macs: Iterable[str]) -> DeviceSnapshot:
+        """Return a copy still reporting the given devices of previous."""
+        devices = dict(self.devices)
+        for mac in macs:
+            devices[mac] = previous.devices[mac]
+        return DeviceSnapshot(
+            lan_devices=self.lan_devices,
+            wlan_devices=self.wlan_devices,
+            devices=MappingProxyType(devices),
+            connected=frozenset(devices),
+        )
+
+    def is_connected(self, mac: str) -> bool:
+        """Return True if the device with the given MAC is connected."""
+        return mac in self.connected
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotDelta:
+    """Difference between two consecutive device snapshots."""
+
+    joined: frozenset[str] = frozenset()
+    left: frozenset[str] = frozenset()
+    changed: frozenset[str] = frozenset()
+
+    @classmethod
+    def between(
+        cls, previous: DeviceSnapshot | None, current: DeviceSnapshot
+    ) -> SnapshotDelta:
+        """Compute which MACs joined, left or changed their router data."""
+        if previous is None:
+            return cls(joined=current.connected)
+
+        previous_devices = previous.devices
+        current_devices = current.devices
+        return cls(
+            joined=current.connected - previous.connected,
+            left=previous.connected - current.connected,
+            changed=frozenset(
+                mac
+                for mac in current.connected & previous.connected
+                if current_devices[mac] != previous_devices[mac]
+            ),
+        )
+
+    @property
+    def affected(self) -> frozenset[str]:
+        """Return every MAC whose entities need a state write."""
+        return self.joined | self.left | self.changed
+
+    def __bool__(self) -> bool:
+        return bool(self.joined or self.left or self.changed)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+JSON_BACKEND_STDLIB = "json"
+JSON_BACKEND_ORJSON = "orjson"
+DEFAULT_JSON_BACKEND = JSON_BACKEND_ORJSON if orjson else JSON_BACKEND_STDLIB
+
+LAN_ATTACHED_DEVICES = "json_lanAttachedDevice"
+PRIMARY_WLAN_ATTACHED_DEVICES = "json_primaryWlanAttachedDevice"
+GUEST_WLAN_ATTACHED_DEVICES = "json_guestWlanAttachedDevice"
+
+ATTACHED_DEVICES_NAME = re.compile(r"json_\w+AttachedDevice")
+# "=(?!=)" skips comparisons such as "json_lanAttachedDevice == null"
+_ATTACHED_DEVICES_ASSIGNMENT = re.compile(
+    rf"\b({ATTACHED_DEVICES_NAME.pattern})\s*=(?!=)\s*"
+)
+_DECODER = json.JSONDecoder()
+
+
+def _decode_stdlib(text: str, start: int) -> tuple[Any, int]:
+    return _DECODER.raw_decode(text, start)
+
+
+def _decode_orjson(text: str, start: int) -> tuple[Any, int]:
+    # orjson cannot decode a prefix, so try each statement terminator as the
+    # end of the value. A ';' inside a string leaves the candidate with an
+    # unterminated string, which orjson rejects, so the first hit is correct.
+    end = text.find(";", start)
+    while end != -1:
+        try:
+            return orjson.loads(text[start:end]), end
+        except orjson.JSONDecodeError:
+            end = text.find(";", end + 1)
+    return _decode_stdlib(text, start)
+
+
+def extract_attached_devices(
+    text: str, backend: str = DEFAULT_JSON_BACKEND
+) -> dict[str, list[dict[str, Any]]]:
+    """Extract every json_*AttachedDevice array from an overview_data.php page.
+
+    The page is scanned once: each assignment is located from the end of the
+    previously decoded value and decoded in place, without splitting or
+    copying the body.
+    """
+    decode = _decode_orjson if backend == JSON_BACKEND_ORJSON else _decode_stdlib
+
+    arrays: dict[str, list[dict[str, Any]]] = {}
+    position = 0
+    while match := _ATTACHED_DEVICES_ASSIGNMENT.search(text, position):
+        name = match.group(1)
+        value, position = decode(text, match.end())
+        if isinstance(value, list):
+            arrays[name] = value
+        else:
+            _LOGGER.debug("Ignoring %s, value is not a JSON array", name)
+
+    _LOGGER.debug("Extracted device arrays: %s", list(arrays))
+    return arrays
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+LANDING_PAGE_ENDPOINT = "index"
+
+
+@dataclass(slots=True)
+class EndpointStatistics:
+    """Request counters for one router endpoint."""
+
+    requests: int = 0
+    bytes_received: int = 0
+    last_latency: float | None = None
+    total_latency: float = 0.0
+
+    @property
+    def average_latency(self) -> float | None:
+        return self.total_latency / self.requests if self.requests else None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "bytes_received": self.bytes_received,
+            "last_latency_ms": _ms(self.last_latency),
+            "average_latency_ms": _ms(self.average_latency),
+        }
+
+
+class PollStatistics:
+    """Latency, size, parse time and failure counters of one router."""
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointStatistics] = {}
+        self.parse_count = 0
+        self.last_parse_time: float | None = None
+        self.total_parse_time = 0.0
+        self.failures: Counter[str] = Counter()
+        # Monotonic start times of coordinator polls, to verify the poll rate
+        self.poll_count = 0
+        self.first_poll: float | None = None
+        self.last_poll: float | None = None
+        self.last_poll_interval: float | None = None
+
+    def record_poll(self, start: float) -> None:
+        if self.last_poll is not None:
+            self.last_poll_interval = start - self.last_poll
+        else:
+            self.first_poll = start
+        self.poll_count += 1
+        self.last_poll = start
+
+    @property
+    def average_poll_interval(self) -> float | None:
+        if self.poll_count < 2:
+            return None
+        return (self.last_poll - self.first_poll) / (self.poll_count - 1)
+
+    def record_request(self, endpoint: str, latency: float, size: int) -> None:
+        if (stats := self.endpoints.get(endpoint)) is None:
+            stats = self.endpoints[endpoint] = EndpointStatistics()
+        stats.requests += 1
+        stats.bytes_received += size
+        stats.last_latency = latency
+        stats.total_latency += latency
+
+    def record_parse(self, duration: float) -> None:
+        self.parse_count += 1
+        self.last_parse_time = duration
+        self.total_parse_time += duration
+
+    def record_failure(self, err: BaseException) -> None:
+        self.failures[type(err).__name__] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "endpoints": {
+                endpoint: stats.as_dict() for endpoint, stats in self.endpoints.items()
+            },
+            "parse_count": self.parse_count,
+            "last_parse_time_ms": _ms(self.last_parse_time),
+            "average_parse_time_ms": _ms(
+                self.total_parse_time / self.parse_count if self.parse_count else None
+            ),
+            "failures": dict(self.failures),
+            "polls": self.poll_count,
+            "last_poll_interval_s": _round(self.last_poll_interval),
+            "average_poll_interval_s": _round(self.average_poll_interval),
+        }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+def _round(seconds: float | None) -> float | None:
+    return round(seconds, 1) if seconds is not None else None
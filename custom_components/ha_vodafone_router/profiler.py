@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+from collections.abc import Awaitable
+import json
+import os
+import pstats
+import time
+from typing import Any
+
+from .poll_stats import PollStatistics
+
+_PACKAGE_DIRECTORY = os.path.dirname(__file__)
+
+# Module and function of this integration whose cumulative time makes up a
+# phase of the update cycle. Time spent waiting on the router is taken from
+# the request statistics instead, because the profiler does not count a
+# suspended coroutine. MAC filtering runs while the records are built.
+PHASE_FUNCTIONS: dict[str, frozenset[tuple[str, str]]] = {
+    "crypto": frozenset(
+        {("sjcl.py", "derive_key"), ("sjcl.py", "encrypt"), ("sjcl.py", "decrypt")}
+    ),
+    "parse": frozenset({("parser.py", "extract_attached_devices")}),
+    "records": frozenset({("models.py", "devices_from_router")}),
+    "snapshot": frozenset(
+        {("models.py", "from_router_data"), ("models.py", "between")}
+    ),
+    "history": frozenset({("coordinator.py", "_record_history")}),
+    "notify": frozenset({("coordinator.py", "async_update_listeners")}),
+}
+
+# Only one cProfile profiler can be active at a time, so the cycles of all
+# coordinators being profiled take turns
+_PROFILE_LOCK = asyncio.Lock()
+
+
+class UpdateCycleProfiler:
+    """Profile a number of coordinator update cycles.
+
+    This is a whole-loop profile: cProfile stays enabled while the refresh
+    waits on the router, so whatever else the event loop runs in the
+    meantime is recorded as well. The phase summary only counts functions
+    of this integration, the .prof file contains everything.
+
+    The coordinator only creates a profiler when asked to, so an idle
+    integration pays nothing beyond checking for it.
+    """
+
+    def __init__(self, cycles: int):
+        self.remaining_cycles = cycles
+        self.profile = cProfile.Profile()
+        self.cycles: list[dict[str, float]] = []
+
+    @property
+    def done(self) -> bool:
+        return self.remaining_cycles <= 0
+
+    async def async_profile_cycle(
+        self, refresh: Awaitable[None], stats: PollStatistics
+    ) -> None:
+        """Run one refresh of the coordinator under the profiler.
+
+        The profiler runs from the start of the refresh until it returns,
+        including the event loop work done while the refresh is suspended.
+        """
+        async with _PROFILE_LOCK:
+            network_before = _total_request_time(stats)
+            start = time.perf_counter()
+            try:
+                self.profile.enable()
+                await refresh
+            finally:
+                self.profile.disable()
+                self.remaining_cycles -= 1
+                self.cycles.append(
+                    {
+                        "total_ms": (time.perf_counter() - start) * 1000,
+                        "network_ms": (_total_request_time(stats) - network_before)
+                        * 1000,
+                    }
+                )
+
+    def phase_summary(self) -> dict[str, float]:
+        """Return the cumulative milliseconds spent in each phase."""
+        summary = dict.fromkeys(PHASE_FUNCTIONS, 0.0)
+        for (filename, _, function), (_, _, _, cumulative, _) in pstats.Stats(
+            self.profile
+        ).stats.items():
+            if not filename.startswith(_PACKAGE_DIRECTORY):
+                continue
+            key = (os.path.basename(filename), function)
+            for phase, functions in PHASE_FUNCTIONS.items():
+                if key in functions:
+                    summary[phase] += cumulative * 1000
+        return summary
+
+    def write(self, directory: str, prefix: str) -> tuple[str, str]:
+        """Write the pstats profile and a JSON timing summary.
+
+        The .prof file can be opened with pstats, snakeviz or converted to a
+        flame graph with flameprof.
+        """
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        profile_path = os.path.join(directory, f"{prefix}_{timestamp}.prof")
+        summary_path = os.path.join(directory, f"{prefix}_{timestamp}.json")
+
+        self.profile.dump_stats(profile_path)
+        summary: dict[str, Any] = {
+            "cycles": self.cycles,
+            "phases_ms": self.phase_summary(),
+        }
+        summary["phases_ms"]["network"] = sum(
+            cycle["network_ms"] for cycle in self.cycles
+        )
+        with open(summary_path, "w", encoding="utf-8") as summary_file:
+            json.dump(summary, summary_file, indent=2)
+
+        return profile_path, summary_path
+
+
+def _total_request_time(stats: PollStatistics) -> float:
+    return sum(endpoint.total_latency for endpoint in stats.endpoints.values())
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+import logging
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, ENTRY_DATA_HOST
+from .coordinator import VodafoneDeviceCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# The statistics change on every poll, even when the device data does not
+SCAN_INTERVAL = timedelta(seconds=60)
+
+OVERVIEW_ENDPOINT = "overview_data.php"
+
+
+@dataclass(frozen=True, kw_only=True)
+class VodafoneDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a Vodafone Station poll diagnostic sensor."""
+
+    value_fn: Callable[[VodafoneDeviceCoordinator], float | int | None]
+
+
+def _overview_latency(coordinator: VodafoneDeviceCoordinator) -> float | None:
+    stats = coordinator.box.stats.endpoints.get(OVERVIEW_ENDPOINT)
+    if stats is None or stats.last_latency is None:
+        return None
+    return round(stats.last_latency * 1000, 1)
+
+
+def _overview_size(coordinator: VodafoneDeviceCoordinator) -> int | None:
+    stats = coordinator.box.stats.endpoints.get(OVERVIEW_ENDPOINT)
+    if stats is None or not stats.requests:
+        return None
+    return stats.bytes_received // stats.requests
+
+
+def _parse_time(coordinator: VodafoneDeviceCoordinator) -> float | None:
+    last_parse_time = coordinator.box.stats.last_parse_time
+    return round(last_parse_time * 1000, 2) if last_parse_time is not None else None
+
+
+DIAGNOSTIC_SENSORS: tuple[VodafoneDiagnosticSensorEntityDescription, ...] = (
+    VodafoneDiagnosticSensorEntityDescription(
+        key="overview_latency",
+        name="Overview latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_overview_latency,
+    ),
+    VodafoneDiagnosticSensorEntityDescription(
+        key="overview_size",
+        name="Overview size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_overview_size,
+    ),
+    VodafoneDiagnosticSensorEntityDescription(
+        key="parse_time",
+        name="Parse time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_parse_time,
+    ),
+    VodafoneDiagnosticSensorEntityDescription(
+        key="logins",
+        name="Logins",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.session.login_count,
+    ),
+    VodafoneDiagnosticSensorEntityDescription(
+        key="relogins",
+        name="Relogins",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.session.relogin_count,
+    ),
+    VodafoneDiagnosticSensorEntityDescription(
+        key="retries",
+        name="Retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.session.retry_count,
+    ),
+    VodafoneDiagnosticSensorEntityDescription(
+        key="poll_failures",
+        name="Poll failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.box.stats.failures.total(),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up Vodafone Station poll diagnostic sensors."""
+    _LOGGER.info("Setting up Vodafone diagnostic sensors for entry: %s", entry.entry_id)
+
+    coordinator: VodafoneDeviceCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        VodafoneDiagnosticSensor(coordinator, entry, description)
+        for description in DIAGNOSTIC_SENSORS
+    )
+
+
+class VodafoneDiagnosticSensor(SensorEntity):
+    """Diagnostic sensor exposing poll statistics of a Vodafone Station."""
+
+    entity_description: VodafoneDiagnosticSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: VodafoneDeviceCoordinator,
+        entry: ConfigEntry,
+        description: VodafoneDiagnosticSensorEntityDescription,
+    ) -> None:
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_name = (
+            f"Vodafone Station ({entry.data[ENTRY_DATA_HOST]}) {description.name}"
+        )
+        self._attr_unique_id = f"vodafone_{entry.entry_id}_{description.key}"
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the current value of the statistic."""
+        return self.entity_description.value_fn(self.coordinator)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import Any
+
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF,
+    RETRY_BUDGET,
+    RETRY_OVERLOAD_BACKOFF,
+)
+from .exceptions import RouterOverloadedError, SessionExpiredError, TransientRouterError
+from .mac_filter import MacFilter
+from .sources import DEFAULT_SOURCES, DeviceSource
+from .vodafone_box import VodafoneBox
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VodafoneSessionManager:
+    """Keep a VodafoneBox logged in for as long as the router accepts it.
+
+    A new login is only performed when the router signals that the session
+    expired, instead of on a fixed schedule. Network errors and an overloaded
+    router are retried with backoff on the same session.
+    """
+
+    def __init__(
+        self,
+        box: VodafoneBox,
+        username: str,
+        password: str,
+        store: Store[dict[str, str]],
+    ):
+        self.box = box
+        self.username = username
+        self.password = password
+        self._store = store
+        self.login_count = 0
+        self.relogin_count = 0
+        self.retry_count = 0
+
+    async def async_login(self):
+        """Perform a full login and persist the resulting session."""
+        _LOGGER.info(
+            "Attempting to login to Vodafone Station for user: %s", self.username
+        )
+        try:
+            await self.box.async_login(self.username, self.password)
+            _LOGGER.info("Successfully logged in to Vodafone Station")
+        except Exception as e:
+            _LOGGER.error("Failed to login to Vodafone Station: %s", e)
+            raise
+
+        self.login_count += 1
+        await self.async_save()
+
+    async def async_save(self):
+        """Persist the current session so it survives a restart."""
+        if (session := self.box.export_session()) is not None:
+            await self._store.async_save(session)
+
+    async def async_clear(self):
+        """Remove the persisted session, the router logged it out.
+
+        A session saved since, e.g. by the entry reloaded with other
+        credentials, is kept.
+        """
+        session = await self._store.async_load()
+        if session and session.get("session_id") == self.box.session_id:
+            _LOGGER.debug("Removing persisted router session")
+            await self._store.async_remove()
+
+    async def async_restore(self) -> bool:
+        """Load the session persisted before the last restart into the box."""
+        session = await self._store.async_load()
+        if not session:
+            _LOGGER.debug("No persisted router session found")
+            return False
+
+        self.box.restore_session(session)
+        return True
+
+    async def async_get_connected_devices(
+        self,
+        sources: tuple[DeviceSource, ...] = DEFAULT_SOURCES,
+        mac_filter: MacFilter | None = None,
+    ) -> dict[str, Any]:
+        """Fetch the connected devices, retrying transient errors.
+
+        Only an expired session triggers a new login, at most once per fetch.
+        The login shares the retries and the retry budget of the fetch.
+        """
+        relogged_in = False
+        login_pending = False
+        attempt = 0
+        slept = 0.0
+        while True:
+            try:
+                if login_pending:
+                    await self.async_login()
+                    login_pending = False
+                return await self.box.async_get_connected_devices(sources, mac_filter)
+            except SessionExpiredError as err:
+                if relogged_in:
+                    raise
+                relogged_in = login_pending = True
+                self.relogin_count += 1
+                _LOGGER.info(
+                    "Router session expired (%s), logging in again (relogin #%s)",
+                    err,
+                    self.relogin_count,
+                )
+            except TransientRouterError as err:
+                attempt += 1
+                delay = _retry_delay(err, attempt)
+                if attempt > RETRY_ATTEMPTS or slept + delay > RETRY_BUDGET:
+                    _LOGGER.warning(
+                        "Giving up on router after %s attempts: %s", attempt, err
+                    )
+                    raise
+                self.retry_count += 1
+                slept += delay
+                _LOGGER.info(
+                    "Transient router error (%s), retrying in %.1f seconds",
+                    err,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+
+def _retry_delay(err: TransientRouterError, attempt: int) -> float:
+    """Exponential backoff, longer and honouring Retry-After for overload."""
+    if isinstance(err, RouterOverloadedError):
+        delay = RETRY_OVERLOAD_BACKOFF * 2 ** (attempt - 1)
+        if err.retry_after is not None:
+            delay = max(delay, err.retry_after)
+        return delay
+    return RETRY_BACKOFF * 2 ** (attempt - 1) * random.uniform(1, 1.5)
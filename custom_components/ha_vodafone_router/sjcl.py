@@ -1,72 +1,98 @@
-import binascii
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
 
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.ciphers.aead import AESCCM
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
 
+DEFAULT_SJCL_ITERATIONS = 1000
+DEFAULT_SJCL_KEYSIZEBITS = 128
+DEFAULT_SJCL_TAGLENGTH = 128  # bits
 
-class SJCL:
-    DEFAULT_SJCL_ITERATIONS = 1000
-    DEFAULT_SJCL_KEYSIZEBITS = 128
-    DEFAULT_SJCL_TAGLENGTH = 128  # bits
+# Derived keys kept for relogins with an unchanged salt
+PBKDF2_CACHE_SIZE = 8
 
-    @staticmethod
-    def pbkdf2(
-        password: str, salt_hex: str, iterations: int, key_size_bits: int
-    ) -> str:
-        salt = binascii.unhexlify(salt_hex)
+_derived_keys: OrderedDict[tuple[bytes, bytes, int, int], bytes] = OrderedDict()
 
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=key_size_bits // 8,
-            salt=salt,
-            iterations=iterations,
-            backend=default_backend(),
-        )
 
-        key = kdf.derive(password.encode())
-        return binascii.hexlify(key).decode()
+def derive_key(
+    password: str, salt: bytes, iterations: int, key_size_bits: int
+) -> bytes:
+    """Return the PBKDF2-SHA256 key for password and salt.
+
+    Keys are cached by a digest of the password and the salt, so the
+    password itself is not kept as a cache key.
+    """
+    cache_key = (
+        hashlib.sha256(password.encode()).digest(),
+        salt,
+        iterations,
+        key_size_bits,
+    )
+    if (key := _derived_keys.get(cache_key)) is not None:
+        _derived_keys.move_to_end(cache_key)
+        return key
+
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=key_size_bits // 8,
+        salt=salt,
+        iterations=iterations,
+        backend=default_backend(),
+    )
+    key = _derived_keys[cache_key] = kdf.derive(password.encode())
+    if len(_derived_keys) > PBKDF2_CACHE_SIZE:
+        _derived_keys.popitem(last=False)
+    return key
 
-    @staticmethod
-    def ccm_encrypt(
-        derived_key_hex: str,
-        plaintext: str,
-        iv_hex: str,
-        auth_data: str,
-        tag_len_bits: int,
-    ) -> str:
-        key = binascii.unhexlify(derived_key_hex)
-        iv = binascii.unhexlify(iv_hex)
-
-        aesccm = AESCCM(key, tag_length=tag_len_bits // 8)
-
-        ciphertext = aesccm.encrypt(
-            iv,
-            plaintext.encode(),
-            auth_data.encode(),
-        )
 
-        return binascii.hexlify(ciphertext).decode()
+def clear_key_cache() -> None:
+    """Forget all cached derived keys."""
+    _derived_keys.clear()
 
-    @staticmethod
-    def ccm_decrypt(
-        derived_key_hex: str,
-        cipher_hex: str,
+
+class SJCLContext:
+    """Derived key and IV of one login, with a reusable AES-CCM cipher.
+
+    Key and IV are held as bytes, only the ciphertexts exchanged with the
+    router are hex encoded.
+    """
+
+    __slots__ = ("key", "iv", "_cipher")
+
+    def __init__(
+        self, key: bytes, iv: bytes, tag_len_bits: int = DEFAULT_SJCL_TAGLENGTH
+    ):
+        self.key = key
+        self.iv = iv
+        self._cipher = AESCCM(key, tag_length=tag_len_bits // 8)
+
+    @classmethod
+    def from_password(
+        cls,
+        password: str,
+        salt_hex: str,
         iv_hex: str,
-        auth_data: str,
-        tag_len_bits: int,
-    ) -> str:
-        key = binascii.unhexlify(derived_key_hex)
-        iv = binascii.unhexlify(iv_hex)
-        ciphertext = binascii.unhexlify(cipher_hex)
-
-        aesccm = AESCCM(key, tag_length=tag_len_bits // 8)
-
-        plaintext = aesccm.decrypt(
-            iv,
-            ciphertext,
-            auth_data.encode(),
+        iterations: int = DEFAULT_SJCL_ITERATIONS,
+        key_size_bits: int = DEFAULT_SJCL_KEYSIZEBITS,
+    ) -> SJCLContext:
+        """Derive the key from the password and the salt sent by the router."""
+        return cls(
+            derive_key(password, bytes.fromhex(salt_hex), iterations, key_size_bits),
+            bytes.fromhex(iv_hex),
         )
 
-        return plaintext.decode()
+    def encrypt(self, plaintext: str, auth_data: str) -> str:
+        """Encrypt plaintext to the hex ciphertext the router expects."""
+        return self._cipher.encrypt(
+            self.iv, plaintext.encode(), auth_data.encode()
+        ).hex()
+
+    def decrypt(self, cipher_hex: str, auth_data: str) -> str:
+        """Decrypt a hex ciphertext sent by the router."""
+        return self._cipher.decrypt(
+            self.iv, bytes.fromhex(cipher_hex), auth_data.encode()
+        ).decode()
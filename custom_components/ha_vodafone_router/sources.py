@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+import re
+from typing import NamedTuple
+
+from .const import (
+    DEVICE_SOURCE_GUEST_WLAN,
+    DEVICE_SOURCE_LAN,
+    DEVICE_SOURCE_PRIMARY_WLAN,
+    ROUTER_PROPERTY_LAN_DEVICES,
+    ROUTER_PROPERTY_WLAN_DEVICES,
+)
+from .parser import (
+    ATTACHED_DEVICES_NAME,
+    GUEST_WLAN_ATTACHED_DEVICES,
+    LAN_ATTACHED_DEVICES,
+    PRIMARY_WLAN_ATTACHED_DEVICES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+OVERVIEW_ENDPOINT = "overview_data.php"
+
+_ENDPOINT_PATTERN = re.compile(r"[\w.-]+\.php")
+
+
+class DeviceSource(NamedTuple):
+    """A json_*AttachedDevice array on one router endpoint."""
+
+    endpoint: str
+    array: str
+    interface: str
+    # Required arrays missing from the page mean the page format changed
+    required: bool = False
+
+
+BUILTIN_DEVICE_SOURCES: dict[str, DeviceSource] = {
+    DEVICE_SOURCE_LAN: DeviceSource(
+        OVERVIEW_ENDPOINT, LAN_ATTACHED_DEVICES, ROUTER_PROPERTY_LAN_DEVICES, True
+    ),
+    DEVICE_SOURCE_PRIMARY_WLAN: DeviceSource(
+        OVERVIEW_ENDPOINT,
+        PRIMARY_WLAN_ATTACHED_DEVICES,
+        ROUTER_PROPERTY_WLAN_DEVICES,
+        True,
+    ),
+    # Only present while the guest network is enabled
+    DEVICE_SOURCE_GUEST_WLAN: DeviceSource(
+        OVERVIEW_ENDPOINT, GUEST_WLAN_ATTACHED_DEVICES, ROUTER_PROPERTY_WLAN_DEVICES
+    ),
+}
+
+DEFAULT_SOURCES: tuple[DeviceSource, ...] = (
+    BUILTIN_DEVICE_SOURCES[DEVICE_SOURCE_LAN],
+    BUILTIN_DEVICE_SOURCES[DEVICE_SOURCE_PRIMARY_WLAN],
+)
+
+
+def parse_extra_device_source(entry: str) -> DeviceSource | None:
+    """Parse an "endpoint.php:json_nameAttachedDevice" entry.
+
+    The endpoint defaults to the overview page. Arrays with "Wlan" in their
+    name are reported as wireless devices.
+    """
+    endpoint, _, array = entry.strip().rpartition(":")
+    endpoint = endpoint.strip() or OVERVIEW_ENDPOINT
+    array = array.strip()
+    if not _ENDPOINT_PATTERN.fullmatch(endpoint) or not (
+        ATTACHED_DEVICES_NAME.fullmatch(array)
+    ):
+        return None
+    interface = (
+        ROUTER_PROPERTY_WLAN_DEVICES
+        if "wlan" in array.lower()
+        else ROUTER_PROPERTY_LAN_DEVICES
+    )
+    return DeviceSource(endpoint, array, interface)
+
+
+def parse_device_sources(
+    selected: Iterable[str], extra_sources: str = ""
+) -> tuple[DeviceSource, ...]:
+    """Resolve the selected built-in sources and the comma-separated extras."""
+    sources = [
+        BUILTIN_DEVICE_SOURCES[key] for key in selected if key in BUILTIN_DEVICE_SOURCES
+    ]
+    for entry in extra_sources.split(","):
+        if not entry.strip():
+            continue
+        if (source := parse_extra_device_source(entry)) is None:
+            _LOGGER.warning("Ignoring invalid device source: %s", entry.strip())
+            continue
+        sources.append(source)
+
+    # The order decides which list wins for a device reported twice
+    return tuple(dict.fromkeys(sources)) or DEFAULT_SOURCES
@@ -1,30 +1,106 @@
+import asyncio
+import codecs
+import contextlib
 import random
 import json
-import requests
 import re
 import logging
-
-from .sjcl import SJCL
+import time
+from typing import Protocol
+
+import aiohttp
+
+from .exceptions import (
+    AuthenticationError,
+    EndpointNotFoundError,
+    ParseDriftError,
+    RouterOverloadedError,
+    SessionExpiredError,
+    TransientRouterError,
+)
+from .mac_filter import MacFilter
+from .models import Device, devices_from_router
+from .const import ROUTER_PROPERTY_LAN_DEVICES, ROUTER_PROPERTY_WLAN_DEVICES
+from .parser import extract_attached_devices
+from .poll_stats import LANDING_PAGE_ENDPOINT, PollStatistics
+from .sjcl import SJCLContext
+from .sources import BUILTIN_DEVICE_SOURCES, DEFAULT_SOURCES, DeviceSource
 
 _LOGGER = logging.getLogger(__name__)
 
 
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+LANDING_PAGE_CHUNK_SIZE = 4096
+LANDING_PAGE_SCAN_OVERLAP = 256
+
+# Statuses of a busy or failing router, worth retrying after a pause
+_OVERLOAD_STATUSES = (429, 500, 502, 503, 504)
+
+_LOGIN_PAGE_MARKERS = ("var myIv = ", "var mySalt = ", "ajaxSet_Password.php")
+
+_IV_PATTERN = re.compile(r"var myIv = '(.+?)';")
+_SALT_PATTERN = re.compile(r"var mySalt = '(.+?)';")
+
+
+@contextlib.contextmanager
+def _transport_errors(endpoint: str):
+    """Raise network failures of a request as TransientRouterError."""
+    try:
+        yield
+    except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as err:
+        raise TransientRouterError(f"Request to {endpoint} failed: {err!r}") from err
+    except TimeoutError as err:
+        raise TransientRouterError(f"Request to {endpoint} timed out") from err
+
+
+def _check_overload(endpoint: str, response: aiohttp.ClientResponse):
+    if response.status not in _OVERLOAD_STATUSES:
+        return
+    retry_after = response.headers.get("Retry-After")
+    raise RouterOverloadedError(
+        f"Router answered {endpoint} with status {response.status}",
+        float(retry_after) if retry_after and retry_after.isdigit() else None,
+    )
+
+
+class ResponseRecorder(Protocol):
+    """Receives every response of a VodafoneBox with its decoded body."""
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        response: aiohttp.ClientResponse,
+        text: str,
+        elapsed: float,
+    ) -> None: ...
+
+
 class VodafoneBox:
-    def __init__(self, host: str):
+    def __init__(
+        self,
+        host: str,
+        session: aiohttp.ClientSession,
+        request_limiter: contextlib.AbstractAsyncContextManager | None = None,
+    ):
         _LOGGER.debug("Initializing VodafoneBox for host: %s", host)
         self.host = host
         self.base_url = f"http://{host}"
         _LOGGER.debug("Base URL set to: %s", self.base_url)
 
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "X-Requested-With": "XMLHttpRequest",
-                "Referer": f"{self.base_url}/?overview",
-                "Origin": self.base_url,
-                "User-Agent": "Mozilla/5.0",
-            }
-        )
+        # The session is owned by Home Assistant; the PHPSESSID cookie is sent
+        # explicitly per request so several routers can share one connector.
+        self.session = session
+        self.request_limiter = request_limiter or contextlib.nullcontext()
+        self.stats = PollStatistics()
+        # Set to capture responses as replay fixtures, see benchmarks/recording.py
+        self.recorder: ResponseRecorder | None = None
+        self.default_headers = {
+            "X-Requested-With": "XMLHttpRequest",
+            "Referer": f"{self.base_url}/?overview",
+            "Origin": self.base_url,
+            "User-Agent": "Mozilla/5.0",
+        }
 
         self.session_id = None
         self.nonce = None
@@ -33,13 +109,57 @@ class VodafoneBox:
         self.salt = None
         self.key = None
 
-    def _headers(self):
+        # Most polls return an identical overview, which is not parsed again
+        self.overview_unchanged = False
+        self.overview_cache_hits = 0
+        self.overview_cache_misses = 0
+        self._page_cache: dict[str, tuple[tuple, dict[str, tuple[Device, ...]]]] = {}
+        self._overview_key: tuple | None = None
+        self._overview_devices: dict[str, tuple[Device, ...]] | None = None
+        # Optional endpoints the router does not serve, logged once
+        self._absent_endpoints: set[str] = set()
+
+    @property
+    def is_logged_in(self) -> bool:
+        """Return True while the box holds a session from a successful login."""
+        return bool(self.session_id and self.csrf_nonce)
+
+    def export_session(self) -> dict[str, str] | None:
+        """Return the state needed to resume the current router session."""
+        if not self.session_id or not self.csrf_nonce:
+            return None
         return {
-            "Cookie": f"PHPSESSID={self.session_id}",
-            "csrfNonce": self.csrf_nonce,
+            "session_id": self.session_id,
+            "nonce": self.nonce,
+            "csrf_nonce": self.csrf_nonce,
+            "iv": self.iv,
+            "salt": self.salt,
+            "key": self.key,
         }
 
-    def _get(self, endpoint: str, params: str | None = None):
+    def restore_session(self, data: dict[str, str]):
+        """Resume a router session exported by export_session."""
+        _LOGGER.debug("Restoring persisted session for host: %s", self.host)
+        self.session_id = data["session_id"]
+        self.nonce = data["nonce"]
+        self.csrf_nonce = data["csrf_nonce"]
+        self.iv = data["iv"]
+        self.salt = data["salt"]
+        self.key = data["key"]
+
+    def _headers(self):
+        headers = dict(self.default_headers)
+        if self.session_id:
+            headers["Cookie"] = f"PHPSESSID={self.session_id}"
+        headers["csrfNonce"] = self.csrf_nonce
+        return headers
+
+    def _update_session_id(self, response: aiohttp.ClientResponse):
+        cookie = response.cookies.get("PHPSESSID")
+        if cookie is not None and cookie.value:
+            self.session_id = cookie.value
+
+    async def _get(self, endpoint: str, params: str | None = None) -> str:
         url = f"{self.base_url}/php/{endpoint}?_n={self.nonce}"
         if params:
             url += f"&{params}"
@@ -47,15 +167,42 @@ class VodafoneBox:
         _LOGGER.debug(
             "Making GET request to: %s with headers: %s", url, self._headers()
         )
-        response = self.session.get(url, headers=self._headers(), timeout=10)
+        async with self.request_limiter:
+            start = time.perf_counter()
+            with _transport_errors(endpoint):
+                async with self.session.get(
+                    url,
+                    headers=self._headers(),
+                    timeout=REQUEST_TIMEOUT,
+                    allow_redirects=False,
+                ) as response:
+                    body = await response.read()
+            elapsed = time.perf_counter() - start
+            self.stats.record_request(endpoint, elapsed, len(body))
+        text = body.decode(response.get_encoding())
+        if self.recorder is not None:
+            self.recorder.record("GET", endpoint, response, text, elapsed)
         _LOGGER.debug(
             "GET response status: %s, content length: %s",
-            response.status_code,
-            len(response.content),
+            response.status,
+            len(text),
         )
-        return response
 
-    def _post(self, endpoint: str, data=None):
+        _check_overload(endpoint, response)
+        if response.status == 404:
+            raise EndpointNotFoundError(f"Router does not serve {endpoint}")
+        # An expired session is answered with a redirect or the login page
+        if response.status in (301, 302, 303, 307, 401, 403):
+            raise SessionExpiredError(
+                f"Router answered {endpoint} with status {response.status}"
+            )
+        if any(marker in text for marker in _LOGIN_PAGE_MARKERS):
+            raise SessionExpiredError(f"Router answered {endpoint} with the login page")
+        return text
+
+    async def _post(
+        self, endpoint: str, data=None
+    ) -> tuple[aiohttp.ClientResponse, str]:
         url = f"{self.base_url}/php/{endpoint}?_n={self.nonce}"
         _LOGGER.debug(
             "Making POST request to: %s with data: %s and headers: %s",
@@ -63,57 +210,104 @@ class VodafoneBox:
             data,
             self._headers(),
         )
-        response = self.session.post(
-            url, json=data, headers=self._headers(), timeout=10
-        )
+        async with self.request_limiter:
+            start = time.perf_counter()
+            with _transport_errors(endpoint):
+                async with self.session.post(
+                    url, json=data, headers=self._headers(), timeout=REQUEST_TIMEOUT
+                ) as response:
+                    body = await response.read()
+            elapsed = time.perf_counter() - start
+            self.stats.record_request(endpoint, elapsed, len(body))
+        text = body.decode(response.get_encoding())
+        if self.recorder is not None:
+            self.recorder.record("POST", endpoint, response, text, elapsed)
         _LOGGER.debug(
             "POST response status: %s, content length: %s",
-            response.status_code,
-            len(response.content),
+            response.status,
+            len(text),
         )
-        return response
-
-    def _init_crypto_values(self):
-        # First, make an initial request to establish session properly
-        initial_resp = self.session.get(self.base_url, timeout=10)
-
-        # Get session ID from the initial response
-        if initial_resp.cookies.get("PHPSESSID"):
-            self.session_id = initial_resp.cookies.get("PHPSESSID")
+        _check_overload(endpoint, response)
+        return response, text
+
+    async def _scan_base_page(self) -> tuple[str | None, str | None]:
+        """Stream the landing page until both the IV and the salt are found.
+
+        The rest of the page is never transferred once both values are known.
+        """
+        headers = dict(self.default_headers)
+        if self.session_id:
+            headers["Cookie"] = f"PHPSESSID={self.session_id}"
+
+        iv = salt = None
+        received = 0
+        text = ""
+        async with self.request_limiter:
+            start = time.perf_counter()
+            with _transport_errors(LANDING_PAGE_ENDPOINT):
+                async with self.session.get(
+                    self.base_url, headers=headers, timeout=REQUEST_TIMEOUT
+                ) as response:
+                    self._update_session_id(response)
+                    decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(
+                        errors="replace"
+                    )
+                    async for chunk in response.content.iter_chunked(
+                        LANDING_PAGE_CHUNK_SIZE
+                    ):
+                        # Rescan an overlap so values split across chunks are found
+                        scan_from = max(0, len(text) - LANDING_PAGE_SCAN_OVERLAP)
+                        received += len(chunk)
+                        text += decoder.decode(chunk)
+                        if iv is None and (
+                            match := _IV_PATTERN.search(text, scan_from)
+                        ):
+                            iv = match.group(1)
+                        if salt is None and (
+                            match := _SALT_PATTERN.search(text, scan_from)
+                        ):
+                            salt = match.group(1)
+                        if iv and salt:
+                            break
+            elapsed = time.perf_counter() - start
+            self.stats.record_request(LANDING_PAGE_ENDPOINT, elapsed, received)
+        if self.recorder is not None:
+            # Only the scanned part of the page, the replay stops at the same point
+            self.recorder.record("GET", LANDING_PAGE_ENDPOINT, response, text, elapsed)
 
-        # Now make a second request with the session established
-        resp = self.session.get(self.base_url, timeout=10)
-
-        # Update session ID if it changed
-        if resp.cookies.get("PHPSESSID"):
-            self.session_id = resp.cookies.get("PHPSESSID")
+        _LOGGER.debug(
+            "Scanned %s characters of the landing page, IV found: %s, salt found: %s",
+            len(text),
+            iv is not None,
+            salt is not None,
+        )
+        return iv, salt
 
-        print(f"Response text preview: {resp.text[:500]}...")
+    async def _init_crypto_values(self):
+        iv, salt = await self._scan_base_page()
 
-        # Extract crypto values with error checking
-        iv_match = re.search(r"var myIv = '(.+?)';", resp.text)
-        salt_match = re.search(r"var mySalt = '(.+?)';", resp.text)
+        # Routers that only hand out the session cookie on the first request
+        # need a second request with the session established
+        if not (iv and salt and self.session_id):
+            _LOGGER.debug("Landing page requires an established session, retrying")
+            iv, salt = await self._scan_base_page()
 
-        if not iv_match or not iv_match.group(1):
-            raise ValueError(
-                f"Could not extract IV value. Found match: {iv_match.group(0) if iv_match else 'None'}"
-            )
+        if not iv:
+            raise ValueError("Could not extract IV value from the landing page")
 
-        if not salt_match or not salt_match.group(1):
-            raise ValueError(
-                f"Could not extract salt value. Found match: {salt_match.group(0) if salt_match else 'None'}"
-            )
+        if not salt:
+            raise ValueError("Could not extract salt value from the landing page")
 
-        self.iv = iv_match.group(1)
-        self.salt = salt_match.group(1)
+        self.iv = iv
+        self.salt = salt
         self.nonce = str(random.random())[2:7]
 
-        print(f"Extracted IV: '{self.iv}', Salt: '{self.salt}'")
+        _LOGGER.debug("Extracted IV: '%s', Salt: '%s'", self.iv, self.salt)
 
-    def login(self, username: str, password: str):
+    async def async_login(self, username: str, password: str):
         _LOGGER.info("Starting login process for user: %s", username)
         _LOGGER.debug("Initializing crypto values")
-        self._init_crypto_values()
+        await self._init_crypto_values()
 
         js_data = json.dumps(
             {
@@ -127,23 +321,14 @@ class VodafoneBox:
             "Generating encryption key using PBKDF2 with salt: %s",
             self.salt[:10] + "...",
         )
-        self.key = SJCL.pbkdf2(
-            password,
-            self.salt,
-            SJCL.DEFAULT_SJCL_ITERATIONS,
-            SJCL.DEFAULT_SJCL_KEYSIZEBITS,
-        )
+        crypto = SJCLContext.from_password(password, self.salt, self.iv)
+        # Kept hex encoded for the persisted session
+        self.key = crypto.key.hex()
         _LOGGER.debug("Key generated successfully")
 
         auth_data = "loginPassword"
         _LOGGER.debug("Encrypting login data using IV: %s", self.iv[:10] + "...")
-        encrypt_data = SJCL.ccm_encrypt(
-            self.key,
-            js_data,
-            self.iv,
-            auth_data,
-            SJCL.DEFAULT_SJCL_TAGLENGTH,
-        )
+        encrypt_data = crypto.encrypt(js_data, auth_data)
         _LOGGER.debug("Data encrypted successfully, length: %s", len(encrypt_data))
 
         payload = {
@@ -153,21 +338,19 @@ class VodafoneBox:
         }
         _LOGGER.debug("Sending login request with payload for user: %s", username)
 
-        resp = self._post("ajaxSet_Password.php", payload)
-        _LOGGER.debug(
-            "Login response status: %s, content: %s", resp.status_code, resp.text[:200]
-        )
+        resp, text = await self._post("ajaxSet_Password.php", payload)
+        _LOGGER.debug("Login response status: %s, content: %s", resp.status, text[:200])
 
-        if resp.status_code == 200:
+        if resp.status == 200:
             _LOGGER.info("Login successful for user: %s", username)
         else:
             _LOGGER.error(
-                "Login failed for user: %s with status: %s", username, resp.status_code
+                "Login failed for user: %s with status: %s", username, resp.status
             )
-            raise Exception(f"Login failed with status {resp.status_code}: {resp.text}")
+            raise Exception(f"Login failed with status {resp.status}: {text}")
 
         _LOGGER.debug("Parsing login response JSON")
-        data = resp.json()
+        data = json.loads(text)
         _LOGGER.debug("Login response data: %s", data)
 
         status = data.get("p_status", "")
@@ -175,7 +358,7 @@ class VodafoneBox:
 
         if "Fail" in status:
             _LOGGER.error("Login failed: wrong password for user: %s", username)
-            raise RuntimeError("Login failed: wrong password")
+            raise AuthenticationError("Login failed: wrong password")
 
         if "Lockout" in status:
             wait_time = data.get("p_waitTime")
@@ -186,27 +369,22 @@ class VodafoneBox:
 
         if "Match" in status:
             _LOGGER.info("Login credentials matched for user: %s", username)
-            self.session_id = resp.cookies.get("PHPSESSID")
+            self._update_session_id(resp)
             _LOGGER.debug("Updated session ID: %s", self.session_id)
 
             _LOGGER.debug("Decrypting CSRF nonce")
-            self.csrf_nonce = SJCL.ccm_decrypt(
-                self.key,
-                data["encryptData"],
-                self.iv,
-                "nonce",
-                SJCL.DEFAULT_SJCL_TAGLENGTH,
-            )
+            self.csrf_nonce = crypto.decrypt(data["encryptData"], "nonce")
             _LOGGER.debug("CSRF nonce decrypted: %s", self.csrf_nonce[:10] + "...")
 
             _LOGGER.debug("Setting session")
-            self._set_session()
+            await self._set_session()
 
-    def _set_session(self):
+    async def _set_session(self):
         _LOGGER.debug("Setting session with CSRF nonce")
-        resp = self._post("ajaxSet_Session.php")
-        login_status = resp.json().get("LoginStatus", "")
-        _LOGGER.debug("Session response: %s", resp.json())
+        _, text = await self._post("ajaxSet_Session.php")
+        data = json.loads(text)
+        login_status = data.get("LoginStatus", "")
+        _LOGGER.debug("Session response: %s", data)
 
         if "yes" not in login_status:
             _LOGGER.warning(
@@ -215,54 +393,176 @@ class VodafoneBox:
         else:
             _LOGGER.info("Session successfully established")
 
-    def logout(self):
+    async def async_logout(self):
         _LOGGER.info("Starting logout process")
-        resp = self._post("logout.php")
-        _LOGGER.debug("Logout response status: %s", resp.status_code)
+        resp, _ = await self._post("logout.php")
+        _LOGGER.debug("Logout response status: %s", resp.status)
 
-        if resp.status_code == 200:
+        self.csrf_nonce = ""
+        if resp.status == 200:
             _LOGGER.info("Logout successful")
         else:
-            _LOGGER.warning("Logout may have failed with status: %s", resp.status_code)
-
-    def get_connected_devices(self):
-        _LOGGER.debug("Fetching connected devices overview data")
-        resp = self._get("overview_data.php")
-        _LOGGER.debug(
-            "Overview data response status: %s, content length: %s",
-            resp.status_code,
-            len(resp.content),
-        )
-
-        text = resp.text
-        _LOGGER.debug("Overview data received, parsing device information")
+            _LOGGER.warning("Logout may have failed with status: %s", resp.status)
+
+    async def async_get_connected_devices(
+        self,
+        sources: tuple[DeviceSource, ...] = DEFAULT_SOURCES,
+        mac_filter: MacFilter | None = None,
+    ) -> dict[str, tuple[Device, ...]]:
+        """Fetch the device lists of every source, merged by MAC.
+
+        Devices rejected by the MAC filter are dropped while parsing.
+
+        Each endpoint is requested once, all endpoints concurrently over the
+        current session, so adding sources on one page costs no extra
+        request and extra endpoints cost no extra round trip in sequence.
+        """
+        endpoints: dict[str, frozenset[str]] = {}
+        for source in sources:
+            endpoints[source.endpoint] = endpoints.get(source.endpoint, frozenset()) | {
+                source.array
+            }
 
-        try:
-            _LOGGER.debug("Extracting LAN devices JSON from response")
-            lan_devices = json.loads(
-                text.split("json_lanAttachedDevice = ")[1].split(";")[0]
-            )
-            _LOGGER.info("Found %s LAN devices", len(lan_devices))
-            _LOGGER.debug(
-                "LAN Devices: %s", [d.get("MAC", "Unknown") for d in lan_devices]
+        # Only pages of required sources tell an expired session apart from
+        # an optional page the firmware does not have
+        required = {endpoint for endpoint in endpoints if self._is_required(endpoint)}
+
+        _LOGGER.debug("Fetching device lists from %s", list(endpoints))
+        results = await asyncio.gather(
+            *(
+                self._async_get_endpoint_devices(
+                    endpoint,
+                    arrays,
+                    mac_filter,
+                    endpoint in required or not required,
+                )
+                for endpoint, arrays in endpoints.items()
             )
+        )
 
-            _LOGGER.debug("Extracting WLAN devices JSON from response")
-            wireless_devices = json.loads(
-                text.split("json_primaryWlanAttachedDevice = ")[1].split(";")[0]
-            )
-            _LOGGER.info("Found %s WLAN devices", len(wireless_devices))
+        self.overview_unchanged = (
+            sources,
+            mac_filter,
+        ) == self._overview_key and not any(
+            parse_time is not None for _, parse_time in results
+        )
+        if self.overview_unchanged:
+            self.overview_cache_hits += 1
             _LOGGER.debug(
-                "WLAN Devices: %s", [d.get("MAC", "Unknown") for d in wireless_devices]
+                "Device data unchanged, reusing parsed devices (hits: %s, misses: %s)",
+                self.overview_cache_hits,
+                self.overview_cache_misses,
             )
+            return self._overview_devices
+        self.overview_cache_misses += 1
+        self.stats.record_parse(
+            sum(parse_time for _, parse_time in results if parse_time is not None)
+        )
 
-            return {
-                "lanDevices": lan_devices,
-                "wlanDevices": wireless_devices,
-            }
-        except (json.JSONDecodeError, IndexError, KeyError) as e:
-            _LOGGER.error(
-                "Failed to parse device information from overview data: %s", e
-            )
+        pages = dict(zip(endpoints, (arrays for arrays, _ in results)))
+        merged: dict[str, list[Device]] = {
+            ROUTER_PROPERTY_LAN_DEVICES: [],
+            ROUTER_PROPERTY_WLAN_DEVICES: [],
+        }
+        seen: set[str] = set()
+        for source in sources:
+            for device in pages[source.endpoint].get(source.array, ()):
+                # The first source reporting a device wins
+                if device.mac not in seen:
+                    seen.add(device.mac)
+                    merged[source.interface].append(device)
+
+        devices = {interface: tuple(found) for interface, found in merged.items()}
+        _LOGGER.info(
+            "Found %s LAN devices and %s WLAN devices",
+            len(devices[ROUTER_PROPERTY_LAN_DEVICES]),
+            len(devices[ROUTER_PROPERTY_WLAN_DEVICES]),
+        )
+        self._overview_key = (sources, mac_filter)
+        self._overview_devices = devices
+        return devices
+
+    async def _async_get_endpoint_devices(
+        self,
+        endpoint: str,
+        wanted: frozenset[str],
+        mac_filter: MacFilter | None = None,
+        signals_expiry: bool = True,
+    ) -> tuple[dict[str, tuple[Device, ...]], float | None]:
+        """Fetch one endpoint and convert the wanted device arrays.
+
+        Returns the devices by array name and the parse time, None if the
+        response was identical to the previous one and was not parsed again.
+        Unless signals_expiry is set, a missing page or a page without
+        device arrays is reported as an endpoint without devices.
+        """
+        try:
+            text = await self._get(endpoint)
+        except (EndpointNotFoundError, SessionExpiredError) as err:
+            if signals_expiry:
+                raise
+            return self._endpoint_absent(endpoint, err)
+
+        page_hash = hash(text)
+        cache_key = (page_hash, wanted, mac_filter)
+        cached_key, cached_devices = self._page_cache.get(endpoint, (None, None))
+        if cached_key == cache_key:
+            return cached_devices, None
+
+        _LOGGER.debug("%s changed, parsing device information", endpoint)
+        parse_start = time.perf_counter()
+        try:
+            arrays = extract_attached_devices(text)
+            if not arrays:
+                if not signals_expiry:
+                    return self._endpoint_absent(endpoint, "no device lists")
+                # Logged out sessions get a page without any device data
+                raise SessionExpiredError(f"{endpoint} contains no device lists")
+
+            devices: dict[str, tuple[Device, ...]] = {}
+            for name in wanted:
+                if name in arrays:
+                    devices[name] = devices_from_router(arrays[name], mac_filter)
+                    _LOGGER.debug(
+                        "%s: %s", name, [device.mac for device in devices[name]]
+                    )
+                elif self._is_required(endpoint, name):
+                    raise KeyError(name)
+                else:
+                    _LOGGER.debug("%s is not reported by %s", name, endpoint)
+        except (ValueError, KeyError, AttributeError, TypeError) as e:
+            # The router answered with a valid session, so logging in again
+            # will not help; the page format changed
+            _LOGGER.error("Failed to parse device information from %s: %s", endpoint, e)
             _LOGGER.debug("Response text preview: %s", text[:1000])
-            raise
+            raise ParseDriftError(f"Unexpected {endpoint} format: {e!r}") from e
+
+        parse_time = time.perf_counter() - parse_start
+        self._page_cache[endpoint] = (cache_key, devices)
+        self._absent_endpoints.discard(endpoint)
+        return devices, parse_time
+
+    def _endpoint_absent(
+        self, endpoint: str, reason: object
+    ) -> tuple[dict[str, tuple[Device, ...]], float | None]:
+        """Report an optional endpoint without devices.
+
+        A parse time of zero marks the poll where the endpoint disappeared
+        as changed, later polls reuse the merged devices.
+        """
+        self._page_cache.pop(endpoint, None)
+        if endpoint in self._absent_endpoints:
+            _LOGGER.debug("Device source %s still absent (%s)", endpoint, reason)
+            return {}, None
+        self._absent_endpoints.add(endpoint)
+        _LOGGER.info("Skipping device source %s (%s)", endpoint, reason)
+        return {}, 0.0
+
+    @staticmethod
+    def _is_required(endpoint: str, array: str | None = None) -> bool:
+        return any(
+            source.required
+            and source.endpoint == endpoint
+            and array in (None, source.array)
+            for source in BUILTIN_DEVICE_SOURCES.values()
+        )
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+import voluptuous as vol
+
+from .const import ATTR_ENTRY_ID, DOMAIN, WS_TYPE_SUBSCRIBE_DEVICES
+
+# Sent to subscribers when their entry unloads, they may subscribe again
+ERR_ENTRY_UNLOADED = "entry_unloaded"
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the websocket commands of the integration."""
+    websocket_api.async_register_command(hass, websocket_subscribe_devices)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SUBSCRIBE_DEVICES,
+        vol.Required(ATTR_ENTRY_ID): str,
+    }
+)
+@callback
+def websocket_subscribe_devices(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send the connected devices of a router, then the delta of each update."""
+    if (coordinator := hass.data.get(DOMAIN, {}).get(msg[ATTR_ENTRY_ID])) is None:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            f"No loaded Vodafone Station entry with id {msg[ATTR_ENTRY_ID]}",
+        )
+        return
+
+    @callback
+    def forward_delta(delta: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], delta))
+
+    @callback
+    def end_subscription() -> None:
+        connection.subscriptions.pop(msg["id"], None)
+        connection.send_error(
+            msg["id"],
+            ERR_ENTRY_UNLOADED,
+            f"Vodafone Station entry {msg[ATTR_ENTRY_ID]} was unloaded",
+        )
+
+    connection.subscriptions[msg["id"]] = coordinator.async_add_delta_listener(
+        forward_delta, end_subscription
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(msg["id"], coordinator.async_snapshot_message())
+    )